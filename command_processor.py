@@ -1,4 +1,27 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, FrozenSet, List, Mapping, Optional, Set, Tuple
+from types import MappingProxyType
+import functools
+import re
+
+from src.utils.regex_utils import literal_trie_pattern
+
+_NUM_RE = re.compile(r'\d+')
+# A whitespace-delimited word containing a dot that neither starts nor ends with one
+_URL_RE = re.compile(r'(?<!\S)(?!\.)\S*\.\S*(?<!\.)(?!\S)')
+_NAME_KEYWORDS = frozenset(('called', 'named', 'name', 'workspace', 'project'))
+
+
+def _fixed_command(command_type: str, action: str) -> MappingProxyType:
+    """Build a read-only command result that takes no parameters"""
+    return MappingProxyType({"type": command_type, "action": action, "params": MappingProxyType({})})
+
+
+# Parameterless results are built once and shared; parse_command copies them
+_VOICE_COMMANDS = {action: _fixed_command("voice", action) for action in ('stop', 'resume', 'read')}
+_SCREEN_READ = _fixed_command("screen", "read")
+_SCREEN_READ_CODE = _fixed_command("screen", "read_code")
+_VSCODE_OPEN = _fixed_command("vscode", "open")
+_SYSTEM_COMMANDS = {action: _fixed_command("system", action) for action in ('shutdown', 'restart', 'unknown')}
 
 
 class EnhancedCommandProcessor:
@@ -55,48 +78,98 @@ class EnhancedCommandProcessor:
             }
         }
 
-    def parse_command(self, text: str) -> dict:
-        """Parse command text to identify intent and parameters"""
-        text = text.lower().strip()
+        # Single-pass keyword scanner built once from the command table
+        self._keyword_re, self._keyword_hits = self._build_keyword_index()
 
-        # Check for voice control commands first (highest priority)
-        for action, phrases in self.commands['voice_control'].items():
-            if self._fuzzy_match_phrases(text, phrases):
-                return {
-                    "type": "voice",
-                    "action": action,
-                    "params": {}
-                }
+        # Multi-word voice phrases pre-split for partial matching, paired
+        # with the number of words needed to reach the 70% match threshold
+        self._fuzzy_phrases = {
+            action: [
+                (words, next(n for n in range(len(words) + 1) if n / len(words) >= 0.7))
+                for words in (tuple(phrase.split()) for phrase in phrases)
+                if len(words) > 1
+            ]
+            for action, phrases in self.commands['voice_control'].items()
+        }
+        self._fuzzy_words = frozenset(
+            word for phrases in self._fuzzy_phrases.values() for words, _ in phrases for word in words
+        )
 
-        # Check for screen reading commands
-        if any(word in text for word in self.commands['screen_reading']['screen']):
-            if any(word in text for word in self.commands['screen_reading']['code']):
-                return {
-                    "type": "screen",
-                    "action": "read_code",
-                    "params": {}
-                }
-            return {
-                "type": "screen",
-                "action": "read",
-                "params": {}
-            }
+        # Scanner paths for each window/system action in table order, so the
+        # action lookup is a set membership test per action
+        self._action_paths = {
+            category: tuple(((category, 'actions', action), action) for action in self.commands[category]['actions'])
+            for category in ('window', 'system')
+        }
+
+        # Matchers in dispatch priority order; the first non-None result wins.
+        # Categories share keywords ('stop', 'screen'), so the order is fixed.
+        self._pipeline = (
+            self._match_voice_command,
+            self._match_screen_command,
+            functools.partial(self._match_category, ('vscode', 'keywords'), self._parse_vscode_command),
+            functools.partial(self._match_category, ('browser', 'keywords'), self._parse_browser_command),
+            functools.partial(self._match_category, ('window', 'keywords'), self._parse_window_command),
+            functools.partial(self._match_category, ('system', 'keywords'), self._parse_system_command),
+        )
+
+        # Repeated commands ("open vs code", "stop") skip the scan entirely
+        self._parse_cached = functools.lru_cache(maxsize=256)(self._parse)
+
+    def _build_keyword_index(self) -> Tuple[re.Pattern, Dict[str, FrozenSet[tuple]]]:
+        """Compile every keyword into one overlapping-match scanner
+
+        Each keyword maps to the (category, ..., action) paths of every
+        vocabulary entry it contains, so the longest keyword found at a
+        position also reports the shorter keywords nested inside it.
+        """
+        paths = {}
+
+        def collect(node, path):
+            if isinstance(node, dict):
+                for key, child in node.items():
+                    collect(child, path + (key,))
+            else:
+                for keyword in node:
+                    paths.setdefault(keyword, set()).add(path)
 
-        # Check for VS Code commands
-        if any(kw in text for kw in self.commands['vscode']['keywords']):
-            return self._parse_vscode_command(text)
+        collect(self.commands, ())
 
-        # Check for browser commands
-        if any(kw in text for kw in self.commands['browser']['keywords']):
-            return self._parse_browser_command(text)
+        hits = {
+            keyword: frozenset().union(*(paths[other] for other in paths if other in keyword))
+            for keyword in paths
+        }
+
+        # One trie-shaped alternation, so the engine follows one branch per
+        # position and prefers the longest keyword
+        pattern = re.compile('(?=(' + literal_trie_pattern(paths) + '))')
+        return pattern, hits
+
+    def _scan_keywords(self, text: str) -> Set[tuple]:
+        """Return the command table paths whose keywords occur in text"""
+        hits = set()
+        for match in self._keyword_re.finditer(text):
+            hits |= self._keyword_hits[match.group(1)]
+        return hits
 
-        # Check for window commands
-        if any(kw in text for kw in self.commands['window']['keywords']):
-            return self._parse_window_command(text)
+    def parse_command(self, text: str) -> dict:
+        """Parse command text to identify intent and parameters"""
+        # str.lower/strip already take CPython's ASCII fast path; a
+        # str.translate table is roughly 10x slower for command-length input
+        result = self._parse_cached(text.lower().strip())
+        # Hand out a fresh mutable copy; cached and prebuilt results are shared
+        return {**result, "params": dict(result["params"])}
 
-        # Check for system commands
-        if any(kw in text for kw in self.commands['system']['keywords']):
-            return self._parse_system_command(text)
+    def _parse(self, text: str) -> Mapping[str, Any]:
+        """Parse normalized command text (cached by parse_command)"""
+        hits = self._scan_keywords(text)
+        words = text.split()
+        tokens = frozenset(words)
+
+        for match in self._pipeline:
+            command = match(text, words, tokens, hits)
+            if command is not None:
+                return command
 
         # Default to AI query for unrecognized commands
         return {
@@ -105,25 +178,46 @@ class EnhancedCommandProcessor:
             "params": {"query": text}
         }
 
-    def _fuzzy_match_phrases(self, text: str, phrases: List[str]) -> bool:
-        """Improved fuzzy matching for commands"""
-        for phrase in phrases:
-            if phrase in text:
+    def _match_voice_command(self, text: str, words: List[str], tokens: FrozenSet[str],
+                             hits: Set[tuple]) -> Optional[Mapping[str, Any]]:
+        """Match voice control commands (highest priority)"""
+        # Partial phrase matching can only succeed if a phrase word is present
+        fuzzy = not self._fuzzy_words.isdisjoint(tokens)
+        for action, phrases in self._fuzzy_phrases.items():
+            if ('voice_control', action) in hits or (fuzzy and self._fuzzy_match_phrases(tokens, phrases)):
+                return _VOICE_COMMANDS[action]
+        return None
+
+    def _match_screen_command(self, text: str, words: List[str], tokens: FrozenSet[str],
+                              hits: Set[tuple]) -> Optional[Mapping[str, Any]]:
+        """Match screen reading commands"""
+        if ('screen_reading', 'screen') not in hits:
+            return None
+        if ('screen_reading', 'code') in hits:
+            return _SCREEN_READ_CODE
+        return _SCREEN_READ
+
+    def _match_category(self, trigger: tuple, parser: Callable, text: str, words: List[str],
+                        tokens: FrozenSet[str], hits: Set[tuple]) -> Optional[Mapping[str, Any]]:
+        """Hand the command to a category parser when its trigger keywords fired"""
+        if trigger not in hits:
+            return None
+        return parser(text, words, hits)
+
+    def _fuzzy_match_phrases(self, tokens: FrozenSet[str], phrases: List[Tuple[tuple, int]]) -> bool:
+        """Partial word matching for multi-word phrases the keyword scan missed"""
+        for words, needed in phrases:
+            matched_words = sum(1 for word in words if word in tokens)
+            if matched_words >= needed:
                 return True
-            # Check for partial matches
-            words = phrase.split()
-            if len(words) > 1:
-                matched_words = sum(1 for word in words if word in text.split())
-                if matched_words / len(words) >= 0.7:  # 70% match threshold
-                    return True
         return False
 
-    def _parse_vscode_command(self, text: str) -> Dict[str, Any]:
+    def _parse_vscode_command(self, text: str, words: List[str], hits: Set[tuple]) -> Mapping[str, Any]:
         """Parse VS Code specific commands"""
-        if any(kw in text for kw in self.commands['vscode']['actions']['create']):
+        if ('vscode', 'actions', 'create') in hits:
             # Handle workspace creation
-            if any(kw in text for kw in self.commands['vscode']['actions']['workspace']):
-                name = self._extract_name(text)
+            if ('vscode', 'actions', 'workspace') in hits:
+                name = self._extract_name(words)
                 return {
                     "type": "vscode",
                     "action": "create_workspace",
@@ -132,7 +226,7 @@ class EnhancedCommandProcessor:
 
         # Handle file opening
         if 'file' in text:
-            file_path = self._extract_path(text)
+            file_path = self._extract_path(words)
             return {
                 "type": "vscode",
                 "action": "open_file",
@@ -140,20 +234,16 @@ class EnhancedCommandProcessor:
             }
 
         # Default VS Code open
-        return {
-            "type": "vscode",
-            "action": "open",
-            "params": {}
-        }
+        return _VSCODE_OPEN
 
-    def _parse_browser_command(self, text: str) -> Dict[str, Any]:
+    def _parse_browser_command(self, text: str, words: List[str], hits: Set[tuple]) -> Mapping[str, Any]:
         """Parse browser specific commands"""
         browser = self._detect_browser(text)
         url = self._extract_url(text)
-        private = any(kw in text for kw in self.commands['browser']['actions']['private'])
+        private = ('browser', 'actions', 'private') in hits
 
         # Check for search command
-        if any(kw in text for kw in self.commands['browser']['actions']['search']):
+        if ('browser', 'actions', 'search') in hits:
             search_terms = self._extract_search_terms(text)
             return {
                 "type": "browser",
@@ -187,10 +277,10 @@ class EnhancedCommandProcessor:
             }
         }
 
-    def _parse_window_command(self, text: str) -> Dict[str, Any]:
+    def _parse_window_command(self, text: str, words: List[str], hits: Set[tuple]) -> Mapping[str, Any]:
         """Parse window management commands"""
-        for action, keywords in self.commands['window']['actions'].items():
-            if any(kw in text for kw in keywords):
+        for path, action in self._action_paths['window']:
+            if path in hits:
                 app = self._detect_app(text)
                 return {
                     "type": "window",
@@ -203,10 +293,10 @@ class EnhancedCommandProcessor:
             "params": {"app": self._detect_app(text)}
         }
 
-    def _parse_system_command(self, text: str) -> Dict[str, Any]:
+    def _parse_system_command(self, text: str, words: List[str], hits: Set[tuple]) -> Mapping[str, Any]:
         """Parse system control commands"""
-        for action, keywords in self.commands['system']['actions'].items():
-            if any(kw in text for kw in keywords):
+        for path, action in self._action_paths['system']:
+            if path in hits:
                 if action == 'volume':
                     level = self._extract_number(text)
                     return {
@@ -221,29 +311,20 @@ class EnhancedCommandProcessor:
                         "action": "set_brightness",
                         "params": {"level": level if level is not None else 50}
                     }
-                return {
-                    "type": "system",
-                    "action": action,
-                    "params": {}
-                }
-        return {
-            "type": "system",
-            "action": "unknown",
-            "params": {}
-        }
+                return _SYSTEM_COMMANDS[action]
+        return _SYSTEM_COMMANDS['unknown']
 
-    def _extract_name(self, text: str) -> str:
-        """Extract project/workspace name from command"""
-        keywords = ['called', 'named', 'name', 'workspace', 'project']
-        words = text.split()
+    def _extract_name(self, words: List[str]) -> str:
+        """Extract project/workspace name from command words"""
+        if _NAME_KEYWORDS.isdisjoint(words):
+            return ""
         for i, word in enumerate(words):
-            if word in keywords and i + 1 < len(words):
+            if word in _NAME_KEYWORDS and i + 1 < len(words):
                 return words[i + 1]
         return ""
 
-    def _extract_path(self, text: str) -> str:
-        """Extract file path from command"""
-        words = text.split()
+    def _extract_path(self, words: List[str]) -> str:
+        """Extract file path from command words"""
         if 'file' in words:
             idx = words.index('file')
             if idx + 1 < len(words):
@@ -252,14 +333,10 @@ class EnhancedCommandProcessor:
 
     def _extract_url(self, text: str) -> str:
         """Extract URL from command"""
-        words = text.split()
-        for word in words:
-            if ('.' in word and
-                    not word.startswith('.') and
-                    not word.endswith('.') and
-                    ' ' not in word):
-                return word
-        return ""
+        if '.' not in text:
+            return ""
+        match = _URL_RE.search(text)
+        return match.group() if match else ""
 
     def _extract_search_terms(self, text: str) -> str:
         """Extract search terms from command"""
@@ -273,9 +350,8 @@ class EnhancedCommandProcessor:
 
     def _extract_number(self, text: str) -> int:
         """Extract number from command"""
-        import re
-        numbers = re.findall(r'\d+', text)
-        return int(numbers[0]) if numbers else None
+        match = _NUM_RE.search(text)
+        return int(match.group()) if match else None
 
     def _detect_browser(self, text: str) -> str:
         """Detect which browser is mentioned"""
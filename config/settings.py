@@ -1,13 +1,21 @@
-from pydantic import BaseSettings
+from dataclasses import asdict, dataclass, field, fields
 from dotenv import load_dotenv
+import functools
+import json
 import os
 
 load_dotenv()
 
 
-class Settings(BaseSettings):
+def _app_dir(name: str) -> str:
+    """Resolve a directory under the user's home when a Settings instance is created"""
+    return os.path.join(os.path.expanduser("~"), ".ai_debug_assistant", name)
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     # OpenAI Settings
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_API_KEY: str = ""
     GPT_MODEL: str = "gpt-4"
     MAX_TOKENS: int = 2000
     TEMPERATURE: float = 0.7
@@ -29,13 +37,15 @@ class Settings(BaseSettings):
     # Server Settings
     SERVER_HOST: str = "0.0.0.0"
     SERVER_PORT: int = 8000
+    # uvicorn worker processes; each has its own clients and request counters
+    SERVER_WORKERS: int = 1
 
     # Path Settings
-    LOG_DIR: str = os.path.join(os.path.expanduser("~"), ".ai_debug_assistant", "logs")
-    DATA_DIR: str = os.path.join(os.path.expanduser("~"), ".ai_debug_assistant", "data")
+    LOG_DIR: str = field(default_factory=lambda: _app_dir("logs"))
+    DATA_DIR: str = field(default_factory=lambda: _app_dir("data"))
 
     # Browser Settings
-    SUPPORTED_BROWSERS: list = ["chrome", "firefox"]
+    SUPPORTED_BROWSERS: list = field(default_factory=lambda: ["chrome", "firefox"])
     DEFAULT_BROWSER: str = "chrome"
     BROWSER_TIMEOUT: int = 30  # seconds
 
@@ -43,22 +53,29 @@ class Settings(BaseSettings):
     COMMAND_HISTORY_SIZE: int = 100
     COMMAND_TIMEOUT: int = 60  # seconds
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-
-    def initialize_directories(self):
-        """Create necessary directories"""
-        os.makedirs(self.LOG_DIR, exist_ok=True)
-        os.makedirs(self.DATA_DIR, exist_ok=True)
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Create settings, overriding defaults with matching environment variables"""
+        overrides = {}
+        for setting in fields(cls):
+            value = os.environ.get(setting.name)
+            if value is not None:
+                overrides[setting.name] = json.loads(value) if setting.type is list else setting.type(value)
+        return cls(**overrides)
 
     def save_to_env(self):
         """Save current settings to .env file"""
         with open(".env", "w") as f:
-            for field_name, field_value in self.dict().items():
+            for field_name, field_value in asdict(self).items():
                 if isinstance(field_value, (str, int, float, bool)):
                     f.write(f"{field_name}={field_value}\n")
 
 
-settings = Settings()
-settings.initialize_directories()
\ No newline at end of file
+settings = Settings.from_env()
+
+
+@functools.cache
+def initialize_directories():
+    """Create necessary directories (only the first call touches the disk)"""
+    os.makedirs(settings.LOG_DIR, exist_ok=True)
+    os.makedirs(settings.DATA_DIR, exist_ok=True)
@@ -1,13 +1,10 @@
-from openai import AsyncOpenAI
-import json
-import os
+import orjson
+import time
 from typing import Dict, Any
 
+from src.ai.openai_client import get_openai_client
 
-class AIManager:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.system_prompt = """You are a programming assistant that controls VS Code and other applications.
+SYSTEM_PROMPT = """You are a programming assistant that controls VS Code and other applications.
         Always respond in JSON format with the following structure:
         {
             "command": {
@@ -44,23 +41,41 @@ class AIManager:
 
         Keep responses concise and clear."""
 
+# Built once so every request sends a byte-identical system message
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+TEST_MESSAGES = [SYSTEM_MESSAGE, {"role": "user", "content": "Test connection"}]
+
+# Seconds a successful connection test is trusted before probing again
+CONNECTION_OK_TTL = 30
+
+
+class AIManager:
+    def __init__(self):
+        self.client = get_openai_client()
+        self.system_prompt = SYSTEM_PROMPT
+        self._last_ok = float("-inf")
+
     async def process_query(self, query: str) -> Dict[str, Any]:
         """Process query through OpenAI and return structured response"""
         try:
-            response = await self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model="gpt-4",
                 messages=[
-                    {"role": "system", "content": self.system_prompt},
+                    SYSTEM_MESSAGE,
                     {"role": "user", "content": query}
                 ],
-                max_tokens=150
+                max_tokens=150,
+                stream=True
             )
 
-            # Parse the response as JSON
-            response_text = response.choices[0].message.content
-            return json.loads(response_text)
+            # Collect the streamed tokens and parse the response as JSON once
+            parts = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+            return orjson.loads("".join(parts))
 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return {
                 "command": {"type": "error", "action": "none", "params": {}},
                 "response": "Could not parse AI response"
@@ -72,16 +87,16 @@ class AIManager:
             }
 
     async def test_connection(self) -> bool:
-        """Test connection to OpenAI"""
+        """Test connection to OpenAI (reuses a recent successful result)"""
+        if time.monotonic() - self._last_ok < CONNECTION_OK_TTL:
+            return True
         try:
-            response = await self.client.chat.completions.create(
+            await self.client.chat.completions.create(
                 model="gpt-4",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": "Test connection"}
-                ],
-                max_tokens=50
+                messages=TEST_MESSAGES,
+                max_tokens=1
             )
+            self._last_ok = time.monotonic()
             return True
         except Exception as e:
             print(f"Failed to connect to OpenAI: {e}")
@@ -1,15 +1,77 @@
-from openai import AsyncOpenAI
 from typing import Dict, List, Optional
-import json
-import os
+import orjson
 from dotenv import load_dotenv
 
+from src.ai.openai_client import get_openai_client
+
 # Load environment variables
 load_dotenv()
 
+ANALYSIS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert programming assistant specializing in debugging and code analysis."
+}
+FIX_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert programming assistant specializing in code fixes and improvements."
+}
+
+# Prompt skeletons are built once; only the dynamic sections are filled per request
+ANALYSIS_PROMPT_TEMPLATE = """
+        Please analyze the following code:
+        ```
+        {code}
+        ```
+
+        {error_section}
+        {context_section}
+
+        Please provide:
+        1. Detailed analysis of potential issues
+        2. Root cause identification
+        3. Suggested improvements
+        4. Best practices that could prevent similar issues
+
+        Format your response as JSON with the following structure:
+        {{
+            "analysis": {{"issues": [], "root_cause": ""}},
+            "suggestions": {{"fixes": [], "improvements": [], "best_practices": []}}
+        }}
+        """
+
+FIX_PROMPT_TEMPLATE = """
+        Given this code:
+        ```
+        {code}
+        ```
+
+        Analysis results:
+        {analysis}
+
+        Similar patterns found:
+        {patterns}
+
+        Please provide:
+        1. Specific code fixes
+        2. Alternative solutions
+        3. Implementation guidance
+
+        Format your response as JSON with the following structure:
+        {{
+            "fixes": [
+                {{"description": "", "code": "", "explanation": ""}}
+            ],
+            "alternatives": [
+                {{"approach": "", "benefits": [], "code_example": ""}}
+            ],
+            "implementation_steps": []
+        }}
+        """
+
+
 class GPTClient:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
         self.model = "gpt-4"
         self.max_tokens = 2000
         self.temperature = 0.7
@@ -19,7 +81,7 @@ class GPTClient:
         """Analyze code and provide debugging suggestions"""
         self.request_count += 1
         messages = [
-            {"role": "system", "content": "You are an expert programming assistant specializing in debugging and code analysis."},
+            ANALYSIS_SYSTEM_MESSAGE,
             {"role": "user", "content": self._create_analysis_prompt(code, error, context)}
         ]
 
@@ -44,7 +106,7 @@ class GPTClient:
         """Generate fix suggestions based on analysis and similar patterns"""
         self.request_count += 1
         messages = [
-            {"role": "system", "content": "You are an expert programming assistant specializing in code fixes and improvements."},
+            FIX_SYSTEM_MESSAGE,
             {"role": "user", "content": self._create_fix_prompt(code, analysis, similar_patterns)}
         ]
 
@@ -68,61 +130,19 @@ class GPTClient:
 
     def _create_analysis_prompt(self, code: str, error: Optional[str], context: Optional[str]) -> str:
         """Create prompt for code analysis"""
-        prompt = f"""
-        Please analyze the following code:
-        ```
-        {code}
-        ```
-
-        {f'Error message:\n{error}\n' if error else ''}
-        {f'Additional context:\n{context}\n' if context else ''}
-
-        Please provide:
-        1. Detailed analysis of potential issues
-        2. Root cause identification
-        3. Suggested improvements
-        4. Best practices that could prevent similar issues
-
-        Format your response as JSON with the following structure:
-        {{
-            "analysis": {{"issues": [], "root_cause": ""}},
-            "suggestions": {{"fixes": [], "improvements": [], "best_practices": []}}
-        }}
-        """
-        return prompt
+        return ANALYSIS_PROMPT_TEMPLATE.format(
+            code=code,
+            error_section=f"Error message:\n{error}\n" if error else "",
+            context_section=f"Additional context:\n{context}\n" if context else ""
+        )
 
     def _create_fix_prompt(self, code: str, analysis: Dict, similar_patterns: List[Dict]) -> str:
         """Create prompt for fix suggestions"""
-        patterns_str = json.dumps(similar_patterns, indent=2)
-        prompt = f"""
-        Given this code:
-        ```
-        {code}
-        ```
-
-        Analysis results:
-        {json.dumps(analysis, indent=2)}
-
-        Similar patterns found:
-        {patterns_str}
-
-        Please provide:
-        1. Specific code fixes
-        2. Alternative solutions
-        3. Implementation guidance
-
-        Format your response as JSON with the following structure:
-        {{
-            "fixes": [
-                {{"description": "", "code": "", "explanation": ""}}
-            ],
-            "alternatives": [
-                {{"approach": "", "benefits": [], "code_example": ""}}
-            ],
-            "implementation_steps": []
-        }}
-        """
-        return prompt
+        return FIX_PROMPT_TEMPLATE.format(
+            code=code,
+            analysis=orjson.dumps(analysis, option=orjson.OPT_NON_STR_KEYS).decode(),
+            patterns=orjson.dumps(similar_patterns, option=orjson.OPT_NON_STR_KEYS).decode()
+        )
 
     def _parse_response(self, response: str) -> Dict:
         """Parse GPT response and ensure it's valid JSON"""
@@ -133,8 +153,8 @@ class GPTClient:
             elif "```" in response:
                 response = response.split("```")[1].split("```")[0]
 
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
             return {
                 "error": "Failed to parse response",
                 "raw_response": response
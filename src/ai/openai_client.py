@@ -0,0 +1,18 @@
+from openai import AsyncOpenAI
+import functools
+import httpx
+import os
+
+
+@functools.cache
+def get_openai_client() -> AsyncOpenAI:
+    """Get the process-wide OpenAI client so all callers share one connection pool"""
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            # Keep the SDK's 600s read timeout: non-streamed gpt-4 answers send
+            # nothing until generation finishes
+            timeout=httpx.Timeout(600.0, connect=5.0)
+        )
+    )
@@ -2,16 +2,15 @@ from typing import Dict, List, Optional
 
 
 class PromptTemplates:
-    @staticmethod
-    def code_analysis(code: str, error: Optional[str] = None, context: Optional[str] = None) -> str:
-        return f"""
+    # Prompt skeletons are built once; only the dynamic sections are filled per call
+    CODE_ANALYSIS_TEMPLATE = """
         Please analyze this code and provide a detailed review:
 
         ```
         {code}
         ```
-        {f'Error encountered:\n{error}\n' if error else ''}
-        {f'Context:\n{context}\n' if context else ''}
+        {error_section}
+        {context_section}
 
         Provide the following:
         1. Potential issues and bugs
@@ -32,12 +31,7 @@ class PromptTemplates:
         }}
         """
 
-    @staticmethod
-    def fix_suggestion(code: str, analysis: Dict, similar_patterns: List[Dict]) -> str:
-        patterns_str = "\n".join(
-            [f"- {p.get('description', '')}" for p in similar_patterns]) if similar_patterns else "None found"
-
-        return f"""
+    FIX_SUGGESTION_TEMPLATE = """
         Given this code:
         ```
         {code}
@@ -47,7 +41,7 @@ class PromptTemplates:
         {analysis}
 
         Similar patterns found:
-        {patterns_str}
+        {patterns}
 
         Please provide:
         1. Specific code fixes
@@ -66,4 +60,19 @@ class PromptTemplates:
             "implementation": {{"steps": [], "considerations": []}},
             "prevention": {{"best_practices": [], "code_examples": []}}
         }}
-        """
\ No newline at end of file
+        """
+
+    @staticmethod
+    def code_analysis(code: str, error: Optional[str] = None, context: Optional[str] = None) -> str:
+        return PromptTemplates.CODE_ANALYSIS_TEMPLATE.format(
+            code=code,
+            error_section=f"Error encountered:\n{error}\n" if error else "",
+            context_section=f"Context:\n{context}\n" if context else ""
+        )
+
+    @staticmethod
+    def fix_suggestion(code: str, analysis: Dict, similar_patterns: List[Dict]) -> str:
+        patterns_str = "\n".join(
+            [f"- {p.get('description', '')}" for p in similar_patterns]) if similar_patterns else "None found"
+
+        return PromptTemplates.FIX_SUGGESTION_TEMPLATE.format(code=code, analysis=analysis, patterns=patterns_str)
@@ -1,6 +1,36 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import functools
 import re
 
+from src.utils.regex_utils import literal_trie_pattern
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_error_patterns(error_patterns: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> tuple:
+    """Build the error type scanner from (error_type, patterns) pairs
+
+    The error patterns are plain text, so all of them share one scanner over
+    the lowercased error; each matched literal maps to the best (earliest)
+    error type among the patterns it contains. The per-pattern list is kept
+    for non-ASCII input.
+    """
+    error_types = [error_type for error_type, _ in error_patterns]
+    literal_ranks = {}
+    for rank, (_, patterns) in enumerate(error_patterns):
+        for pattern in patterns:
+            literal_ranks.setdefault(pattern.lower(), rank)
+    error_literal_ranks = {
+        literal: min(rank for other, rank in literal_ranks.items() if other in literal)
+        for literal in literal_ranks
+    }
+    error_type_re = re.compile(literal_trie_pattern(literal_ranks))
+    error_patterns_compiled = [
+        (re.compile(pattern, re.IGNORECASE), rank)
+        for rank, (_, patterns) in enumerate(error_patterns)
+        for pattern in patterns
+    ]
+    return error_types, error_literal_ranks, error_type_re, error_patterns_compiled
+
 
 class BugClassifier:
     def __init__(self):
@@ -72,6 +102,20 @@ class BugClassifier:
             }
         }
 
+        # Patterns compiled once so classification skips the re module cache;
+        # instances with the same tables share one compiled set
+        (self._error_types, self._error_literal_ranks, self._error_type_re,
+         self._error_patterns_compiled) = _compile_error_patterns(
+            tuple((error_type, tuple(patterns)) for error_type, patterns in self.error_patterns.items())
+        )
+        self._language_patterns_compiled = {
+            language: {name: re.compile(pattern, re.IGNORECASE) for name, pattern in patterns.items()}
+            for language, patterns in self.language_patterns.items()
+        }
+
+        # Words that make any error critical, matched against the lowercased error
+        self.critical_patterns = ('memory', 'corruption', 'crash', 'deadlock', 'recursion')
+
         # Fix suggestions for common errors
         self.fix_suggestions = {
             'syntax_error': [
@@ -96,15 +140,90 @@ class BugClassifier:
             ]
         }
 
+        # Probable causes for common errors
+        self.common_causes = {
+            'syntax_error': (
+                "Missing or extra parentheses/brackets",
+                "Incorrect indentation",
+                "Missing colons or semicolons"
+            ),
+            'type_error': (
+                "Incompatible data types in operation",
+                "Null/None value used in operation",
+                "Wrong type conversion"
+            ),
+            'name_error': (
+                "Variable not defined",
+                "Variable used outside its scope",
+                "Typo in variable name"
+            )
+        }
+
+        # Language-specific causes and fixes, keyed by (language, error_type)
+        self.language_causes = {
+            ('python', 'syntax_error'): ("Missing colon after control statement",),
+            ('python', 'indentation_error'): ("Inconsistent use of tabs and spaces",),
+            ('javascript', 'type_error'): ("Accessing property of undefined",),
+            ('javascript', 'syntax_error'): ("Missing semicolon",)
+        }
+        self.language_fixes = {
+            ('python', 'type_error'): (
+                "Use str() for string conversion",
+                "Use int() for integer conversion",
+                "Use float() for float conversion"
+            ),
+            ('javascript', 'type_error'): (
+                "Use typeof to check variable type",
+                "Check if variable is undefined before use",
+                "Use optional chaining (?.) for nested properties"
+            )
+        }
+
+        # Repeated identical errors (e.g. raised in a loop) skip the analysis
+        self._classify_cached = functools.lru_cache(maxsize=1024)(self._classify)
+
     def classify(self, error: str, context: Optional[str] = None, language: Optional[str] = None) -> Dict:
-        """Classify the type of bug and provide analysis"""
-        error_type = self._identify_error_type(error)
-        severity = self._determine_severity(error_type, error)
+        """Classify the type of bug and provide analysis
+
+        Results are cached on the (error, context, language) strings; each
+        call returns a fresh copy that callers are free to modify.
+        """
+        analysis = self._classify_cached(error, context, language)
+        result = {
+            **analysis,
+            "patterns": list(analysis["patterns"]),
+            "probable_causes": list(analysis["probable_causes"]),
+            "suggested_fixes": list(analysis["suggested_fixes"])
+        }
+        if "context_analysis" in analysis:
+            context_analysis = analysis["context_analysis"]
+            result["context_analysis"] = {**context_analysis, "related_code": list(context_analysis["related_code"])}
+        return result
+
+    def classify_type(self, error: str) -> Dict:
+        """Classify only the error type and severity
+
+        For callers that aggregate many errors by type; skips the patterns,
+        causes, fixes and context analysis that classify builds.
+        """
+        error_lower = error.lower()
+        error_type = self._identify_error_type(error, error_lower)
+        return {
+            "error_type": error_type,
+            "severity": self._determine_severity(error_type, error_lower)
+        }
+
+    def _classify(self, error: str, context: Optional[str], language: Optional[str]) -> Dict:
+        """Classify a bug (cached by classify)"""
+        # Lowercase once; the helpers below all probe the same lowered text
+        error_lower = error.lower()
+        error_type = self._identify_error_type(error, error_lower)
+        severity = self._determine_severity(error_type, error_lower)
 
         analysis = {
             "error_type": error_type,
             "severity": severity,
-            "patterns": self._identify_patterns(error, language),
+            "patterns": self._identify_patterns(error, error_lower, language),
             "probable_causes": self._identify_causes(error, error_type, language),
             "suggested_fixes": self._suggest_fixes(error, error_type, language)
         }
@@ -114,28 +233,34 @@ class BugClassifier:
 
         return analysis
 
-    def _identify_error_type(self, error: str) -> str:
+    def _identify_error_type(self, error: str, error_lower: str) -> str:
         """Identify the type of error based on patterns"""
-        error_lower = error.lower()
-
-        for error_type, patterns in self.error_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, error, re.IGNORECASE):
-                    return error_type
-
-        return "unknown_error"
-
-    def _determine_severity(self, error_type: str, error: str) -> str:
+        if not error.isascii():
+            # lower() and re.IGNORECASE fold some non-ASCII letters differently
+            for pattern, rank in self._error_patterns_compiled:
+                if pattern.search(error):
+                    return self._error_types[rank]
+            return "unknown_error"
+
+        # Visit every position where a pattern starts (matches may overlap)
+        # and keep the highest priority type, as the per-type scan did
+        best_rank = len(self._error_types)
+        match = self._error_type_re.search(error_lower)
+        while match:
+            rank = self._error_literal_ranks[match.group()]
+            if rank < best_rank:
+                best_rank = rank
+                if rank == 0:
+                    break
+            match = self._error_type_re.search(error_lower, match.start() + 1)
+
+        if best_rank == len(self._error_types):
+            return "unknown_error"
+        return self._error_types[best_rank]
+
+    def _determine_severity(self, error_type: str, error_lower: str) -> str:
         """Determine the severity of the error"""
-        critical_patterns = [
-            r'memory',
-            r'corruption',
-            r'crash',
-            r'deadlock',
-            r'recursion'
-        ]
-
-        if any(re.search(pattern, error, re.IGNORECASE) for pattern in critical_patterns):
+        if any(word in error_lower for word in self.critical_patterns):
             return "critical"
 
         severity_map = {
@@ -153,114 +278,60 @@ class BugClassifier:
 
         return severity_map.get(error_type, 'medium')
 
-    def _identify_patterns(self, error: str, language: Optional[str] = None) -> List[str]:
+    def _identify_patterns(self, error: str, error_lower: str, language: Optional[str] = None) -> List[str]:
         """Identify common error patterns"""
         patterns = []
 
-        if language and language in self.language_patterns:
-            lang_patterns = self.language_patterns[language]
+        if language and language in self._language_patterns_compiled:
+            lang_patterns = self._language_patterns_compiled[language]
             for pattern_name, pattern in lang_patterns.items():
-                if re.search(pattern, error, re.IGNORECASE):
+                if pattern.search(error):
                     patterns.append(pattern_name)
 
         # Generic patterns
-        if 'line' in error.lower():
+        if 'line' in error_lower:
             patterns.append('line_specific')
-        if 'expected' in error.lower():
+        if 'expected' in error_lower:
             patterns.append('expectation_mismatch')
-        if 'undefined' in error.lower() or 'not defined' in error.lower():
+        if 'undefined' in error_lower or 'not defined' in error_lower:
             patterns.append('undefined_reference')
 
         return patterns
 
     def _identify_causes(self, error: str, error_type: str, language: Optional[str] = None) -> List[str]:
         """Identify probable causes of the error"""
-        causes = []
-
-        common_causes = {
-            'syntax_error': [
-                "Missing or extra parentheses/brackets",
-                "Incorrect indentation",
-                "Missing colons or semicolons"
-            ],
-            'type_error': [
-                "Incompatible data types in operation",
-                "Null/None value used in operation",
-                "Wrong type conversion"
-            ],
-            'name_error': [
-                "Variable not defined",
-                "Variable used outside its scope",
-                "Typo in variable name"
-            ]
-        }
-
-        # Add common causes for the error type
-        causes.extend(common_causes.get(error_type, []))
-
-        # Add language-specific causes
-        if language == 'python':
-            if error_type == 'syntax_error':
-                causes.append("Missing colon after control statement")
-            elif error_type == 'indentation_error':
-                causes.append("Inconsistent use of tabs and spaces")
-
-        elif language == 'javascript':
-            if error_type == 'type_error':
-                causes.append("Accessing property of undefined")
-            elif error_type == 'syntax_error':
-                causes.append("Missing semicolon")
-
+        causes = list(self.common_causes.get(error_type, ()))
+        causes.extend(self.language_causes.get((language, error_type), ()))
         return causes
 
     def _suggest_fixes(self, error: str, error_type: str, language: Optional[str] = None) -> List[str]:
         """Suggest fixes for the error"""
-        suggestions = []
-
-        # Add general suggestions for the error type
-        if error_type in self.fix_suggestions:
-            suggestions.extend(self.fix_suggestions[error_type])
-
-        # Add language-specific suggestions
-        if language == 'python':
-            if error_type == 'type_error':
-                suggestions.extend([
-                    "Use str() for string conversion",
-                    "Use int() for integer conversion",
-                    "Use float() for float conversion"
-                ])
-        elif language == 'javascript':
-            if error_type == 'type_error':
-                suggestions.extend([
-                    "Use typeof to check variable type",
-                    "Check if variable is undefined before use",
-                    "Use optional chaining (?.) for nested properties"
-                ])
-
+        suggestions = list(self.fix_suggestions.get(error_type, ()))
+        suggestions.extend(self.language_fixes.get((language, error_type), ()))
         return suggestions
 
     def _analyze_context(self, context: str, error_type: str) -> Dict:
         """Analyze the context of the error"""
+        context_lower = context.lower()
         return {
-            "scope": self._determine_scope(context),
-            "complexity": self._assess_complexity(context),
+            "scope": self._determine_scope(context_lower),
+            "complexity": self._assess_complexity(context_lower),
             "related_code": self._extract_related_code(context, error_type)
         }
 
-    def _determine_scope(self, context: str) -> str:
+    def _determine_scope(self, context_lower: str) -> str:
         """Determine the scope of the error"""
-        if 'class' in context.lower():
+        if 'class' in context_lower:
             return 'class'
-        elif 'function' in context.lower() or 'def' in context.lower():
+        elif 'function' in context_lower or 'def' in context_lower:
             return 'function'
-        elif 'loop' in context.lower() or 'for' in context.lower() or 'while' in context.lower():
+        elif 'loop' in context_lower or 'for' in context_lower or 'while' in context_lower:
             return 'loop'
         else:
             return 'global'
 
-    def _assess_complexity(self, context: str) -> str:
+    def _assess_complexity(self, context_lower: str) -> str:
         """Assess the complexity of the context"""
-        context_lower = context.lower()
         if any(word in context_lower for word in ['nested', 'recursion', 'recursive']):
             return 'high'
         elif any(word in context_lower for word in ['loop', 'if', 'else', 'elif']):
@@ -270,11 +341,16 @@ class BugClassifier:
 
     def _extract_related_code(self, context: str, error_type: str) -> List[str]:
         """Extract related code snippets from context"""
+        patterns = self.error_patterns.get(error_type, [])
+        # Patterns never span lines, so a miss on the whole context is final
+        if not any(pattern in context for pattern in patterns):
+            return []
+
         lines = context.split('\n')
         related_lines = []
 
         for i, line in enumerate(lines):
-            if any(pattern in line for pattern in self.error_patterns.get(error_type, [])):
+            if any(pattern in line for pattern in patterns):
                 # Include the error line and surrounding lines
                 start = max(0, i - 2)
                 end = min(len(lines), i + 3)
@@ -1,24 +1,123 @@
-from typing import Dict, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
 import ast
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+
+# Substrings that mark code as JavaScript once it fails to parse as Python
+JS_INDICATORS = (
+    "const ", "let ", "var ", "function ", "=>", "console.log",
+    "document.", "window.", "import from", "export "
+)
+
+
+@dataclass
+class _WalkState:
+    """Results gathered by CodeAnalyzer._collect during its tree walk"""
+    complexity: int = 0
+    variables: list = field(default_factory=list)
+    functions: list = field(default_factory=list)
+    function_complexity: list = field(default_factory=list)
+    imports: list = field(default_factory=list)
+    naming_issues: list = field(default_factory=list)
+    error_handling_issues: list = field(default_factory=list)
+    has_try: bool = False
+
+
+def _handle_branch(node: ast.AST, owners: tuple, state: _WalkState) -> tuple:
+    state.complexity += 1
+    for owner in owners:
+        state.function_complexity[owner] += 1
+    return owners
+
+
+def _handle_function(node: ast.FunctionDef, owners: tuple, state: _WalkState) -> tuple:
+    state.complexity += 1
+    owners += (len(state.functions),)
+    state.function_complexity.append(0)
+    for owner in owners:
+        state.function_complexity[owner] += 1
+    state.functions.append({
+        "name": node.name,
+        "args": len(node.args.args),
+        "line": node.lineno
+    })
+    if not node.name.islower():
+        state.naming_issues.append({
+            "type": "naming_convention",
+            "message": f"Function '{node.name}' should use lowercase with underscores",
+            "line": node.lineno
+        })
+    return owners
+
+
+def _handle_assign(node: ast.Assign, owners: tuple, state: _WalkState) -> tuple:
+    for target in node.targets:
+        if isinstance(target, ast.Name):
+            state.variables.append({
+                "name": target.id,
+                "line": target.lineno
+            })
+    return owners
+
+
+def _handle_import(node: ast.Import, owners: tuple, state: _WalkState) -> tuple:
+    state.imports.extend(alias.name for alias in node.names)
+    return owners
+
+
+def _handle_import_from(node: ast.ImportFrom, owners: tuple, state: _WalkState) -> tuple:
+    state.imports.append(f"{node.module}")
+    return owners
+
+
+def _handle_try(node: ast.Try, owners: tuple, state: _WalkState) -> tuple:
+    state.has_try = True
+    if not node.handlers:
+        state.error_handling_issues.append({
+            "type": "error_handling",
+            "message": "Empty try block found",
+            "line": node.lineno
+        })
+    return owners
+
+
+# Exact node class -> handler (the parser never emits ast subclasses). Each
+# handler returns the enclosing function indexes for the node's children.
+_NODE_HANDLERS: Dict[type, Callable[[ast.AST, tuple, _WalkState], tuple]] = {
+    ast.If: _handle_branch,
+    ast.For: _handle_branch,
+    ast.While: _handle_branch,
+    ast.FunctionDef: _handle_function,
+    ast.Assign: _handle_assign,
+    ast.Import: _handle_import,
+    ast.ImportFrom: _handle_import_from,
+    ast.Try: _handle_try,
+}
+
 
 class CodeAnalyzer:
     def analyze(self, code: str, language: Optional[str] = None) -> Dict:
         """Analyze code for common issues and patterns"""
         try:
+            tree = None
             if language is None:
-                language = self._detect_language(code)
+                language, tree = self._detect_language(code)
 
             if language == "python":
-                return self._analyze_python(code)
+                return self._analyze_python(code, tree)
             elif language == "javascript":
                 return self._analyze_javascript(code)
             else:
                 return self._analyze_generic(code)
 
-        except Exception as e:
-            print(f"Error in code analysis: {str(e)}")
+        except TypeError as e:
+            # Raised for non-string input; everything else is handled per language
+            logger.error("Error in code analysis: %s", e)
             return {
                 "language": language or "unknown",
                 "issues": [],
@@ -26,46 +125,25 @@ class CodeAnalyzer:
                 "error": str(e)
             }
 
-    def _detect_language(self, code: str) -> str:
-        """Detect programming language from code"""
+    def _detect_language(self, code: str) -> Tuple[str, Optional[ast.AST]]:
+        """Detect programming language from code, with the parsed tree for Python"""
         # Check for Python syntax
         try:
-            ast.parse(code)
-            return "python"
+            return "python", ast.parse(code)
         except:
             pass
 
         # Check for JavaScript syntax
-        js_indicators = [
-            "const ", "let ", "var ", "function ", "=>", "console.log",
-            "document.", "window.", "import from", "export "
-        ]
-        if any(indicator in code for indicator in js_indicators):
-            return "javascript"
+        if any(indicator in code for indicator in JS_INDICATORS):
+            return "javascript", None
 
-        return "unknown"
+        return "unknown", None
 
-    def _analyze_python(self, code: str) -> Dict:
-        """Analyze Python code"""
+    def _analyze_python(self, code: str, tree: Optional[ast.AST] = None) -> Dict:
+        """Analyze Python code (reusing tree if it was already parsed)"""
         try:
-            tree = ast.parse(code)
-
-            analysis = {
-                "language": "python",
-                "issues": [],
-                "complexity": self._calculate_complexity(tree),
-                "variables": self._extract_variables(tree),
-                "functions": self._analyze_functions(tree),
-                "imports": self._analyze_imports(tree)
-            }
-
-            # Check for common issues
-            self._check_naming_conventions(tree, analysis["issues"])
-            self._check_error_handling(tree, analysis["issues"])
-            self._check_code_style(code, analysis["issues"])
-
-            return analysis
-
+            if tree is None:
+                tree = ast.parse(code)
         except SyntaxError as e:
             return {
                 "language": "python",
@@ -77,7 +155,9 @@ class CodeAnalyzer:
                 }],
                 "complexity": "unknown"
             }
-        except Exception as e:
+        except (TypeError, ValueError, RecursionError, MemoryError) as e:
+            # Non-string input, or source the parser cannot handle (too deeply
+            # nested expressions overflow its stack)
             return {
                 "language": "python",
                 "issues": [{
@@ -87,6 +167,18 @@ class CodeAnalyzer:
                 "complexity": "unknown"
             }
 
+        issues = []
+        analysis = {
+            "language": "python",
+            "issues": issues,
+            **self._collect(tree, issues)
+        }
+
+        # Check for common issues
+        self._check_code_style(code, issues)
+
+        return analysis
+
     def _analyze_javascript(self, code: str) -> Dict:
         """Analyze JavaScript code"""
         analysis = {
@@ -114,13 +206,49 @@ class CodeAnalyzer:
             }
         }
 
-    def _calculate_complexity(self, tree: ast.AST) -> str:
-        """Calculate code complexity score"""
-        complexity = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.For, ast.While, ast.FunctionDef)):
-                complexity += 1
+    def _collect(self, tree: ast.AST, issues: list) -> Dict:
+        """Gather complexity, variables, functions and imports in one tree walk,
+        adding naming and error handling issues to issues"""
+        state = _WalkState()
+
+        # Breadth-first like ast.walk, but each entry also carries the indexes
+        # of its enclosing functions so per-function complexity is counted in
+        # the same pass. Hot names are bound to locals for the loop.
+        dispatch = _NODE_HANDLERS.get
+        iter_child_nodes = ast.iter_child_nodes
+        todo = deque([(tree, ())])
+        popleft = todo.popleft
+        append = todo.append
+
+        while todo:
+            node, owners = popleft()
+            handler = dispatch(node.__class__)
+            if handler is not None:
+                owners = handler(node, owners, state)
+
+            for child in iter_child_nodes(node):
+                append((child, owners))
+
+        for function, count in zip(state.functions, state.function_complexity):
+            function["complexity"] = self._complexity_level(count)
+
+        issues.extend(state.naming_issues)
+        issues.extend(state.error_handling_issues)
+        if not state.has_try:
+            issues.append({
+                "type": "suggestion",
+                "message": "Consider adding error handling with try-except blocks"
+            })
+
+        return {
+            "complexity": self._complexity_level(state.complexity),
+            "variables": state.variables,
+            "functions": state.functions,
+            "imports": state.imports
+        }
 
+    def _complexity_level(self, complexity: int) -> str:
+        """Map a count of branching nodes to a complexity score"""
         if complexity < 5:
             return "low"
         elif complexity < 10:
@@ -128,77 +256,14 @@ class CodeAnalyzer:
         else:
             return "high"
 
-    def _extract_variables(self, tree: ast.AST) -> list:
-        """Extract variable names and types"""
-        variables = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        variables.append({
-                            "name": target.id,
-                            "line": target.lineno
-                        })
-        return variables
-
-    def _analyze_functions(self, tree: ast.AST) -> list:
-        """Analyze function definitions"""
-        functions = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append({
-                    "name": node.name,
-                    "args": len(node.args.args),
-                    "line": node.lineno,
-                    "complexity": self._calculate_function_complexity(node)
-                })
-        return functions
-
-    def _analyze_imports(self, tree: ast.AST) -> list:
-        """Analyze import statements"""
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                imports.extend(alias.name for alias in node.names)
-            elif isinstance(node, ast.ImportFrom):
-                imports.append(f"{node.module}")
-        return imports
-
-    def _check_naming_conventions(self, tree: ast.AST, issues: list):
-        """Check Python naming conventions"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                if not node.name.islower():
-                    issues.append({
-                        "type": "naming_convention",
-                        "message": f"Function '{node.name}' should use lowercase with underscores",
-                        "line": node.lineno
-                    })
-
-    def _check_error_handling(self, tree: ast.AST, issues: list):
-        """Check error handling patterns"""
-        has_try = False
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Try):
-                has_try = True
-                if not node.handlers:
-                    issues.append({
-                        "type": "error_handling",
-                        "message": "Empty try block found",
-                        "line": node.lineno
-                    })
-
-        if not has_try:
-            issues.append({
-                "type": "suggestion",
-                "message": "Consider adding error handling with try-except blocks"
-            })
-
     def _check_code_style(self, code: str, issues: list):
         """Check code style issues"""
+        # Stripping can only shorten a line, so only strip the long ones
+        if len(code) <= 100:
+            return
         lines = code.splitlines()
         for i, line in enumerate(lines, 1):
-            if len(line.strip()) > 100:
+            if len(line) > 100 and len(line.strip()) > 100:
                 issues.append({
                     "type": "style",
                     "message": "Line too long (>100 characters)",
@@ -224,7 +289,8 @@ class CodeAnalyzer:
                 "message": "Use 'const' or 'let' instead of 'var'"
             })
 
-        if "===" not in code and "==" in code:
+        # Most snippets have no "==" at all, so test that before "==="
+        if "==" in code and "===" not in code:
             issues.append({
                 "type": "best_practice",
                 "message": "Use strict equality (===) instead of =="
@@ -238,4 +304,4 @@ class CodeAnalyzer:
         elif lines < 200:
             return "medium"
         else:
-            return "high"
\ No newline at end of file
+            return "high"
@@ -1,10 +1,12 @@
+from collections import namedtuple
+
+# Recorded actions are tuples rather than dicts; use _asdict() for JSON
+Action = namedtuple("Action", ("type", "selector", "value"))
+
+
 class ActionRecorder:
     def __init__(self):
         self.actions = []
         
     def record_action(self, action_type, selector, value=None):
-        self.actions.append({
-            "type": action_type,
-            "selector": selector,
-            "value": value
-        })
\ No newline at end of file
+        self.actions.append(Action(action_type, selector, value))
@@ -1,19 +1,64 @@
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import asyncio
-from urllib.parse import urlparse
+import functools
+import re
+
+# Upper bound on readiness waits; a slower page is reported as opened anyway
+PAGE_READY_TIMEOUT = 5
+ELEMENT_TIMEOUT = 10
+
+# Same test urlparse(url).scheme makes, without parsing the rest of the URL;
+# urlparse also ignores leading control characters and spaces
+_HAS_SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+\-.]*:").match
+_LEADING_IGNORED = "".join(map(chr, range(0x21)))
+
+# Locators and their conditions hold no driver state, so build them once
+SEARCH_BOX = (By.NAME, "q")
+SEARCH_RESULTS = (By.ID, "search")
+_SEARCH_BOX_PRESENT = EC.presence_of_element_located(SEARCH_BOX)
+_SEARCH_RESULTS_PRESENT = EC.presence_of_element_located(SEARCH_RESULTS)
+
+
+def _document_complete(driver) -> bool:
+    return driver.execute_script("return document.readyState") == "complete"
 
 
 class BrowserController:
     def __init__(self):
+        # Keyed by (browser, headless): a headless driver can't serve a visible
+        # request or the other way round, so each mode gets its own
         self.drivers = {}
         self.supported_browsers = ['chrome', 'firefox']
+        # Selenium calls block on WebDriver HTTP round-trips, so they run on
+        # this pool instead of the event loop
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="webdriver")
+        self._driver_locks = {
+            (browser, headless): asyncio.Lock()
+            for browser in self.supported_browsers for headless in (False, True)
+        }
+        # Per-driver (element, page-ready) waits, created alongside the driver
+        self._waits: Dict[Tuple[str, bool], tuple] = {}
+
+    async def _run_blocking(self, func, *args):
+        """Run a blocking Selenium call on the WebDriver thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _wait_until_ready(self, key: Tuple[str, bool], condition) -> bool:
+        """Wait for a readiness condition without blocking the event loop"""
+        try:
+            await self._run_blocking(self._waits[key][1].until, condition)
+            return True
+        except TimeoutException:
+            return False
 
     async def execute_action(self, action_data: Dict) -> Dict:
         """Execute browser action"""
@@ -28,13 +73,15 @@ class BrowserController:
                 return await self._open_url(
                     browser,
                     action_data.get('url'),
-                    action_data.get('private', False)
+                    action_data.get('private', False),
+                    bool(action_data.get('headless', False))
                 )
             elif action == 'search':
                 return await self._perform_search(
                     browser,
                     action_data.get('search_terms', ''),
-                    action_data.get('private', False)
+                    action_data.get('private', False),
+                    bool(action_data.get('headless', False))
                 )
             elif action == 'close':
                 return await self._close_browser(browser)
@@ -49,25 +96,48 @@ class BrowserController:
             }
 
     async def execute_actions(self, actions: List[Dict]) -> List[Dict]:
-        """Execute multiple browser actions"""
-        results = []
-        for action in actions:
-            result = await self.execute_action(action)
-            results.append(result)
+        """Execute multiple browser actions
+
+        Actions for different browsers run concurrently; actions for the same
+        browser run in order, since a WebDriver session is not thread-safe.
+        """
+        groups = {}
+        for index, action in enumerate(actions):
+            browser = action.get('browser', 'chrome') if isinstance(action, dict) else None
+            groups.setdefault(browser.lower() if isinstance(browser, str) else None, []).append(index)
+
+        results: List[Optional[Dict]] = [None] * len(actions)
+
+        async def run_group(indexes: List[int]):
+            for index in indexes:
+                results[index] = await self.execute_action(actions[index])
+
+        outcomes = await asyncio.gather(*(run_group(indexes) for indexes in groups.values()), return_exceptions=True)
+
+        # A group that raised leaves its remaining actions without a result
+        for indexes, outcome in zip(groups.values(), outcomes):
+            if isinstance(outcome, BaseException):
+                for index in indexes:
+                    if results[index] is None:
+                        results[index] = {
+                            "status": "error",
+                            "message": str(outcome)
+                        }
         return results
 
-    async def _open_url(self, browser: str, url: Optional[str], private: bool = False) -> Dict:
+    async def _open_url(self, browser: str, url: Optional[str], private: bool = False,
+                        headless: bool = False) -> Dict:
         """Open URL in specified browser"""
         try:
-            driver = await self._get_driver(browser, private)
+            driver = await self._get_driver(browser, private, headless)
 
             if url:
                 # Add https if no protocol specified
-                if not urlparse(url).scheme:
+                if not _HAS_SCHEME(url.lstrip(_LEADING_IGNORED)):
                     url = f"https://{url}"
 
-                driver.get(url)
-                await asyncio.sleep(1)  # Wait for page to load
+                await self._run_blocking(driver.get, url)
+                await self._wait_until_ready((browser, headless), _document_complete)
 
                 return {
                     "status": "success",
@@ -86,22 +156,25 @@ class BrowserController:
                 "message": f"Failed to open URL: {str(e)}"
             }
 
-    async def _perform_search(self, browser: str, search_terms: str, private: bool = False) -> Dict:
+    async def _perform_search(self, browser: str, search_terms: str, private: bool = False,
+                              headless: bool = False) -> Dict:
         """Perform search in specified browser"""
         try:
-            driver = await self._get_driver(browser, private)
+            driver = await self._get_driver(browser, private, headless)
 
             # Go to Google
-            driver.get("https://www.google.com")
+            await self._run_blocking(driver.get, "https://www.google.com")
 
             # Wait for search box and perform search
-            search_box = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "q"))
+            search_box = await self._run_blocking(
+                self._waits[(browser, headless)][0].until,
+                _SEARCH_BOX_PRESENT
             )
-            search_box.send_keys(search_terms)
-            search_box.send_keys(Keys.RETURN)
+            await self._run_blocking(search_box.send_keys, search_terms)
+            await self._run_blocking(search_box.send_keys, Keys.RETURN)
 
-            await asyncio.sleep(1)  # Wait for results
+            # Wait for results
+            await self._wait_until_ready((browser, headless), _SEARCH_RESULTS_PRESENT)
 
             return {
                 "status": "success",
@@ -116,11 +189,13 @@ class BrowserController:
             }
 
     async def _close_browser(self, browser: str) -> Dict:
-        """Close specified browser"""
+        """Close specified browser, visible and headless instances alike"""
         try:
-            if browser in self.drivers:
-                self.drivers[browser].quit()
-                del self.drivers[browser]
+            keys = [key for key in self.drivers if key[0] == browser]
+            if keys:
+                for key in keys:
+                    await self._run_blocking(self.drivers.pop(key).quit)
+                    self._waits.pop(key, None)
                 return {
                     "status": "success",
                     "message": f"Closed {browser}"
@@ -136,23 +211,46 @@ class BrowserController:
                 "message": f"Failed to close browser: {str(e)}"
             }
 
-    async def _get_driver(self, browser: str, private: bool = False):
-        """Get or create webdriver for specified browser"""
-        if browser not in self.drivers:
-            if browser == 'chrome':
-                options = ChromeOptions()
-                if private:
-                    options.add_argument("--incognito")
-                options.add_argument("--start-maximized")
-                self.drivers[browser] = webdriver.Chrome(options=options)
-            elif browser == 'firefox':
-                options = FirefoxOptions()
-                if private:
-                    options.add_argument("-private")
-                options.add_argument("--start-maximized")
-                self.drivers[browser] = webdriver.Firefox(options=options)
-
-        return self.drivers[browser]
+    async def _get_driver(self, browser: str, private: bool = False, headless: bool = False):
+        """Get or create webdriver for specified browser
+
+        Headless drivers also skip image loading; use them when only the page
+        content matters, not what the user sees.
+        """
+        # Starting a browser takes seconds; the lock keeps concurrent callers
+        # from each launching their own instance
+        key = (browser, headless)
+        async with self._driver_locks[key]:
+            if key not in self.drivers:
+                if browser == 'chrome':
+                    options = ChromeOptions()
+                    if private:
+                        options.add_argument("--incognito")
+                    if headless:
+                        options.add_argument("--headless=new")
+                        options.add_argument("--disable-gpu")
+                        options.add_argument("--blink-settings=imagesEnabled=false")
+                        options.add_experimental_option(
+                            "prefs", {"profile.managed_default_content_settings.images": 2}
+                        )
+                    options.add_argument("--start-maximized")
+                    driver = await self._run_blocking(functools.partial(webdriver.Chrome, options=options))
+                elif browser == 'firefox':
+                    options = FirefoxOptions()
+                    if private:
+                        options.add_argument("-private")
+                    if headless:
+                        options.add_argument("-headless")
+                        options.set_preference("permissions.default.image", 2)
+                    options.add_argument("--start-maximized")
+                    driver = await self._run_blocking(functools.partial(webdriver.Firefox, options=options))
+                self._waits[key] = (
+                    WebDriverWait(driver, ELEMENT_TIMEOUT),
+                    WebDriverWait(driver, PAGE_READY_TIMEOUT)
+                )
+                self.drivers[key] = driver
+
+        return self.drivers[key]
 
     def get_supported_browsers(self) -> List[str]:
         """Get list of supported browsers"""
@@ -160,9 +258,11 @@ class BrowserController:
 
     async def cleanup(self):
         """Clean up all browser instances"""
-        for browser, driver in self.drivers.items():
+        for driver in self.drivers.values():
             try:
-                driver.quit()
+                await self._run_blocking(driver.quit)
             except:
                 pass
-        self.drivers.clear()
\ No newline at end of file
+        self.drivers.clear()
+        self._waits.clear()
+        self._executor.shutdown(wait=False)
\ No newline at end of file
@@ -0,0 +1,154 @@
+from multiprocessing.connection import Client, Listener, wait
+from typing import Dict, List
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+
+from src.automation.browser_controller import BrowserController
+
+# Set by start_browser_host() and inherited by the uvicorn worker processes
+BROWSER_HOST_ADDRESS_ENV = "DEBUG_ASSISTANT_BROWSER_HOST"
+BROWSER_HOST_AUTHKEY_ENV = "DEBUG_ASSISTANT_BROWSER_HOST_KEY"
+
+# Controller methods a client may call
+EXPOSED_METHODS = frozenset(('execute_action', 'execute_actions', 'get_supported_browsers', 'cleanup'))
+
+# Seconds the host spends closing its browsers after the server has gone away
+ORPHAN_CLEANUP_TIMEOUT = 10
+
+
+def _serve_connection(conn, controller: BrowserController, loop: asyncio.AbstractEventLoop):
+    """Answer one client's calls until it disconnects"""
+    with conn:
+        while True:
+            try:
+                method, args = conn.recv()
+            except (EOFError, OSError):
+                return
+
+            try:
+                if method not in EXPOSED_METHODS:
+                    raise ValueError(f"Unsupported browser host call: {method}")
+                result = getattr(controller, method)(*args)
+                if asyncio.iscoroutine(result):
+                    result = asyncio.run_coroutine_threadsafe(result, loop).result()
+                conn.send((True, result))
+            except Exception as e:
+                conn.send((False, str(e)))
+
+
+def _exit_with_parent(controller: BrowserController, loop: asyncio.AbstractEventLoop):
+    """Close the browsers and exit once the server process that started the host is gone
+
+    The server may be killed outright (TerminateProcess on Windows), in which
+    case stop_browser_host never runs.
+    """
+    parent = multiprocessing.parent_process()
+    if parent is None:
+        return
+    wait([parent.sentinel])
+    try:
+        asyncio.run_coroutine_threadsafe(controller.cleanup(), loop).result(timeout=ORPHAN_CLEANUP_TIMEOUT)
+    except Exception:
+        pass
+    os._exit(0)
+
+
+def _run_browser_host(authkey: bytes, ready):
+    """Own the browsers for every API worker; entry point of the host process"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    controller = BrowserController()
+    threading.Thread(target=_exit_with_parent, args=(controller, loop), daemon=True).start()
+
+    with Listener(authkey=authkey) as listener:
+        ready.send(listener.address)
+        ready.close()
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=_serve_connection, args=(conn, controller, loop), daemon=True).start()
+
+
+def start_browser_host() -> multiprocessing.Process:
+    """Start the shared browser host and publish its address to child processes"""
+    authkey = os.urandom(32)
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_run_browser_host,
+        args=(authkey, sender),
+        name="browser-host",
+        daemon=True
+    )
+    process.start()
+    sender.close()
+
+    os.environ[BROWSER_HOST_ADDRESS_ENV] = receiver.recv()
+    os.environ[BROWSER_HOST_AUTHKEY_ENV] = authkey.hex()
+    receiver.close()
+    return process
+
+
+def stop_browser_host(process: multiprocessing.Process):
+    """Close the host's browsers, then stop the process"""
+    try:
+        RemoteBrowserController(os.environ[BROWSER_HOST_ADDRESS_ENV],
+                                bytes.fromhex(os.environ[BROWSER_HOST_AUTHKEY_ENV]))._call('cleanup')
+    except Exception:
+        pass
+    process.terminate()
+    process.join(timeout=5)
+
+
+class RemoteBrowserController:
+    """BrowserController stand-in that forwards calls to the shared browser host"""
+
+    def __init__(self, address: str, authkey: bytes):
+        self._address = address
+        self._authkey = authkey
+        # Idle connections to the host, reused across calls
+        self._connections = queue.SimpleQueue()
+        self.supported_browsers = self._call('get_supported_browsers')
+
+    def _call(self, method: str, *args):
+        try:
+            conn = self._connections.get_nowait()
+        except queue.Empty:
+            conn = Client(self._address, authkey=self._authkey)
+
+        try:
+            conn.send((method, args))
+            ok, result = conn.recv()
+        except Exception:
+            conn.close()
+            raise
+
+        self._connections.put(conn)
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    async def execute_action(self, action_data: Dict) -> Dict:
+        """Execute browser action"""
+        return await asyncio.to_thread(self._call, 'execute_action', action_data)
+
+    async def execute_actions(self, actions: List[Dict]) -> List[Dict]:
+        """Execute multiple browser actions"""
+        return await asyncio.to_thread(self._call, 'execute_actions', actions)
+
+    def get_supported_browsers(self) -> List[str]:
+        """Get list of supported browsers"""
+        return self.supported_browsers
+
+    async def cleanup(self):
+        """Clean up all browser instances"""
+        await asyncio.to_thread(self._call, 'cleanup')
+
+
+def connect_browser_controller():
+    """Use the shared browser host when one is running, else a local controller"""
+    address = os.environ.get(BROWSER_HOST_ADDRESS_ENV)
+    if address:
+        return RemoteBrowserController(address, bytes.fromhex(os.environ[BROWSER_HOST_AUTHKEY_ENV]))
+    return BrowserController()
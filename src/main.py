@@ -1,7 +1,10 @@
 from fastapi import FastAPI, HTTPException, Body
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, List
-import uvicorn
+from contextlib import asynccontextmanager
+import asyncio
+import logging
 import sys
 import os
 
@@ -12,12 +15,28 @@ from src.ai.gpt_client import GPTClient
 from src.memory.manager import MemoryManager
 from src.analysis.code_analyzer import CodeAnalyzer
 from src.automation.browser_controller import BrowserController
-
-app = FastAPI(title="AI Debug Assistant")
+from src.automation.browser_host import connect_browser_controller
+from src.utils.logger import setup_queue_logging
+
+setup_queue_logging()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Quit the browsers on shutdown when this process owns them"""
+    yield
+    # A shared browser host closes its own browsers
+    if isinstance(browser_controller, BrowserController):
+        await browser_controller.cleanup()
+
+# FastAPI still runs jsonable_encoder over the returned dicts; only the final
+# encode to bytes moves from the stdlib json module to orjson
+app = FastAPI(title="AI Debug Assistant", default_response_class=ORJSONResponse, lifespan=lifespan)
 gpt_client = GPTClient()
 memory_manager = MemoryManager()
 code_analyzer = CodeAnalyzer()
-browser_controller = BrowserController()
+# Workers share one browser host process when src.server started one
+browser_controller = connect_browser_controller()
 
 class DebugRequest(BaseModel):
     code: str
@@ -35,6 +54,7 @@ class BrowserActionRequest(BaseModel):
     url: Optional[str] = None
     browser: Optional[str] = "chrome"
     private: Optional[bool] = False
+    headless: Optional[bool] = False
     search_terms: Optional[str] = None
 
 class SystemCommandRequest(BaseModel):
@@ -72,37 +92,39 @@ async def root():
 async def debug_code(request: DebugRequest):
     """Debug code and provide analysis"""
     try:
-        print(f"Received debug request for code: {request.code[:100]}...")
-
-        # Initial code analysis
-        static_analysis = code_analyzer.analyze(request.code)
-
-        # Check memory for similar patterns
-        similar_patterns = memory_manager.find_similar_patterns(
-            code=request.code,
-            error=request.error
+        logger.debug("Received debug request for code: %s...", request.code[:100])
+
+        # Static analysis, memory lookup and AI analysis don't depend on each
+        # other, so they run together; static analysis is CPU work and goes to
+        # a thread to keep the event loop free
+        static_analysis, similar_patterns, ai_analysis = await asyncio.gather(
+            asyncio.to_thread(code_analyzer.analyze, request.code),
+            memory_manager.find_similar_patterns(
+                code=request.code,
+                error=request.error
+            ),
+            gpt_client.analyze_code(
+                code=request.code,
+                error=request.error,
+                context=request.context
+            )
         )
 
-        # Get AI analysis
-        ai_analysis = await gpt_client.analyze_code(
-            code=request.code,
-            error=request.error,
-            context=request.context
-        )
+        analysis = {**static_analysis, **ai_analysis}
 
-        # Generate fix suggestions
-        fix_suggestions = await gpt_client.suggest_fix(
+        # Generate fix suggestions while any requested browser automation runs
+        fix_request = gpt_client.suggest_fix(
             code=request.code,
-            analysis={**static_analysis, **ai_analysis},
+            analysis=analysis,
             similar_patterns=similar_patterns
         )
-
-        # Handle browser automation if requested
-        browser_results = None
         if request.browser_actions:
-            browser_results = await browser_controller.execute_actions(
-                request.browser_actions
+            fix_suggestions, browser_results = await asyncio.gather(
+                fix_request,
+                browser_controller.execute_actions(request.browser_actions)
             )
+        else:
+            fix_suggestions, browser_results = await fix_request, None
 
         # Store debug session in memory
         await memory_manager.store_debug_session({
@@ -114,14 +136,14 @@ async def debug_code(request: DebugRequest):
         })
 
         return {
-            "analysis": {**static_analysis, **ai_analysis},
+            "analysis": analysis,
             "suggestions": fix_suggestions,
             "similar_patterns": similar_patterns,
             "browser_results": browser_results
         }
 
     except Exception as e:
-        print(f"Error processing debug request: {str(e)}")
+        logger.error("Error processing debug request: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/analyze")
@@ -150,7 +172,7 @@ async def analyze_code(request: CodeAnalysisRequest):
         }
 
     except Exception as e:
-        print(f"Error analyzing code: {str(e)}")
+        logger.error("Error analyzing code: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/browser")
@@ -162,6 +184,7 @@ async def execute_browser_action(request: BrowserActionRequest):
             "url": request.url,
             "browser": request.browser,
             "private": request.private,
+            "headless": request.headless,
             "search_terms": request.search_terms
         })
 
@@ -172,7 +195,7 @@ async def execute_browser_action(request: BrowserActionRequest):
         }
 
     except Exception as e:
-        print(f"Error executing browser action: {str(e)}")
+        logger.error("Error executing browser action: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/system")
@@ -200,20 +223,20 @@ async def execute_system_command(request: SystemCommandRequest):
         }
 
     except Exception as e:
-        print(f"Error executing system command: {str(e)}")
+        logger.error("Error executing system command: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/memory/patterns")
 async def get_debug_patterns():
     """Retrieve stored debug patterns"""
     try:
-        patterns = memory_manager.find_similar_patterns()
+        patterns = await memory_manager.find_similar_patterns()
         return {
             "patterns": patterns,
             "count": len(patterns)
         }
     except Exception as e:
-        print(f"Error retrieving patterns: {str(e)}")
+        logger.error("Error retrieving patterns: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/status")
@@ -229,7 +252,7 @@ async def get_system_status():
             },
             "memory": {
                 "status": "active",
-                "patterns_stored": len(memory_manager.find_similar_patterns()),
+                "patterns_stored": await memory_manager.count_patterns(),
                 "last_updated": memory_manager.get_last_update_time()
             },
             "browser": {
@@ -258,8 +281,4 @@ def get_request_count():
 def get_memory_usage():
     """Get current memory usage"""
     # Implementation
-    return "0MB"
-
-if __name__ == "__main__":
-    print("Starting AI Debug Assistant server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    return "0MB"
\ No newline at end of file
@@ -1,19 +1,44 @@
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-import json
+import asyncio
+import orjson
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+# only syncs at checkpoints instead of on every commit
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+"""
+# Most sessions committed in one store transaction
+FLUSH_BATCH_SIZE = 256
 
 
 class MemoryManager:
     def __init__(self):
-        self.db = sqlite3.connect('debug_memory.db')
+        # Autocommit mode; writes that belong together open their own transaction
+        self.db = sqlite3.connect('debug_memory.db', check_same_thread=False, isolation_level=None)
+        self.db.executescript(CONNECTION_PRAGMAS)
+        self.cursor = self.db.cursor()
+        # Queries run on a single worker thread: the event loop never waits on
+        # sqlite I/O, and the shared connection only ever sees one caller
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
         self.init_database()
         self.working_memory = {}
         self.last_update = datetime.now()
+        # Write queue for store_debug_session, drained by a task on the caller's loop
+        self._pending: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
 
     def init_database(self):
         """Initialize SQLite database with enhanced schema"""
-        cursor = self.db.cursor()
+        cursor = self.cursor
 
         # Debug sessions table
         cursor.execute('''
@@ -42,54 +67,148 @@ class MemoryManager:
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_error ON debug_sessions(error)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON debug_sessions(timestamp)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pattern_type ON patterns(pattern_type)')
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_pattern_type_unique'")
+        if cursor.fetchone() is None:
+            # Older databases hold one row per occurrence, since REPLACE had no
+            # unique key to conflict on; fold them into a single counted row
+            cursor.executescript('''
+                BEGIN;
+                UPDATE patterns SET
+                    frequency = (SELECT COUNT(*) FROM patterns p WHERE p.pattern_type = patterns.pattern_type),
+                    last_seen = (SELECT MAX(last_seen) FROM patterns p WHERE p.pattern_type = patterns.pattern_type);
+                DELETE FROM patterns WHERE id NOT IN (SELECT MAX(id) FROM patterns GROUP BY pattern_type);
+                DROP INDEX IF EXISTS idx_pattern_type;
+                CREATE UNIQUE INDEX idx_pattern_type_unique ON patterns(pattern_type);
+                COMMIT;
+            ''')
+
+        # Trigram full-text index over debug_sessions; it answers the
+        # '%...%' LIKE lookups in find_similar_patterns without a table scan
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'debug_sessions_fts'")
+        fts_exists = cursor.fetchone() is not None
+        cursor.executescript('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS debug_sessions_fts USING fts5(
+                code, error, context,
+                content='debug_sessions', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS debug_sessions_ai AFTER INSERT ON debug_sessions BEGIN
+                INSERT INTO debug_sessions_fts(rowid, code, error, context)
+                VALUES (new.id, new.code, new.error, new.context);
+            END;
+            CREATE TRIGGER IF NOT EXISTS debug_sessions_ad AFTER DELETE ON debug_sessions BEGIN
+                INSERT INTO debug_sessions_fts(debug_sessions_fts, rowid, code, error, context)
+                VALUES ('delete', old.id, old.code, old.error, old.context);
+            END;
+            CREATE TRIGGER IF NOT EXISTS debug_sessions_au AFTER UPDATE ON debug_sessions BEGIN
+                INSERT INTO debug_sessions_fts(debug_sessions_fts, rowid, code, error, context)
+                VALUES ('delete', old.id, old.code, old.error, old.context);
+                INSERT INTO debug_sessions_fts(rowid, code, error, context)
+                VALUES (new.id, new.code, new.error, new.context);
+            END;
+        ''')
+        if not fts_exists:
+            # Index sessions stored before the full-text table existed
+            cursor.execute("INSERT INTO debug_sessions_fts(debug_sessions_fts) VALUES ('rebuild')")
 
         self.db.commit()
 
+    async def _run_blocking(self, func, *args):
+        """Run a database call on the sqlite worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
     async def store_debug_session(self, session_data: Dict) -> bool:
-        """Store debugging session data with enhanced error handling"""
+        """Store debugging session data with enhanced error handling
+
+        Sessions are queued and written in batches, one transaction per batch;
+        the call returns once this session's batch has been committed.
+        """
+        # One clock read stamps the session row, its pattern and last_update
+        now = datetime.now()
         try:
-            cursor = self.db.cursor()
-            cursor.execute('''
-                INSERT INTO debug_sessions 
-                (code, error, solution, timestamp, context, success)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
+            row = (
                 session_data.get('code', ''),
                 session_data.get('error', ''),
-                json.dumps(session_data.get('solution', {})),
-                datetime.now().isoformat(),
+                orjson.dumps(session_data.get('solution', {}), option=orjson.OPT_NON_STR_KEYS).decode(),
+                now.isoformat(),
                 session_data.get('context', ''),
                 session_data.get('success', True)
-            ))
+            )
+        except Exception as e:
+            logger.error("Error storing debug session: %s", e)
+            return False
 
-            # Update pattern frequency if error exists
-            if session_data.get('error'):
-                self._update_pattern_frequency(session_data['error'])
+        loop = asyncio.get_running_loop()
+        if self._flusher is None or self._flusher.get_loop() is not loop:
+            self._pending = asyncio.Queue()
+            self._flusher = loop.create_task(self._flush_pending())
 
-            self.db.commit()
-            self.last_update = datetime.now()
-            return True
+        stored = loop.create_future()
+        self._pending.put_nowait((row, now, stored))
+        return await stored
+
+    async def _flush_pending(self):
+        """Write queued sessions; whatever queues up during a write joins the next batch"""
+        while True:
+            batch = [await self._pending.get()]
+            while len(batch) < FLUSH_BATCH_SIZE and not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+
+            entries = [(row, now) for row, now, _ in batch]
+            try:
+                results = await self._run_blocking(self._write_sessions, entries)
+            except Exception as e:
+                logger.error("Error storing debug session: %s", e)
+                results = [False] * len(batch)
+
+            for (_, _, stored), result in zip(batch, results):
+                if not stored.done():
+                    stored.set_result(result)
+
+    def _write_sessions(self, entries: List[tuple]) -> List[bool]:
+        try:
+            cursor = self.cursor
+            # One transaction (and one sync) covers the sessions and their patterns
+            cursor.execute('BEGIN')
+            cursor.executemany('''
+                INSERT INTO debug_sessions 
+                (code, error, solution, timestamp, context, success)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [row for row, _ in entries])
+
+            # Update pattern frequency for sessions with an error
+            self._update_pattern_frequency([(row[1], row[3]) for row, _ in entries if row[1]])
+
+            cursor.execute('COMMIT')
+            self.last_update = entries[-1][1]
+            return [True] * len(entries)
 
         except Exception as e:
-            print(f"Error storing debug session: {e}")
             self.db.rollback()
-            return False
+            if len(entries) == 1:
+                logger.error("Error storing debug session: %s", e)
+                return [False]
+            # Retry one at a time so a single bad session doesn't fail the batch
+            return [self._write_sessions([entry])[0] for entry in entries]
 
-    def find_similar_patterns(self, code: Optional[str] = None, error: Optional[str] = None, limit: int = 5) -> List[
-        Dict]:
+    async def find_similar_patterns(self, code: Optional[str] = None, error: Optional[str] = None,
+                                    limit: int = 5) -> List[Dict]:
         """Find similar debugging patterns with enhanced matching"""
+        return await self._run_blocking(self._find_similar_patterns, code, error, limit)
+
+    def _find_similar_patterns(self, code: Optional[str], error: Optional[str], limit: int) -> List[Dict]:
         try:
-            cursor = self.db.cursor()
+            cursor = self.cursor
             query_conditions = []
             params = []
 
+            # Each column gets its own subquery: the full-text index can serve a
+            # single LIKE constraint, but not an OR across columns
             if error:
-                query_conditions.append("error LIKE ?")
+                query_conditions.append("SELECT rowid FROM debug_sessions_fts WHERE error LIKE ?")
                 params.append(f"%{error}%")
 
             if code:
-                query_conditions.append("code LIKE ?")
+                query_conditions.append("SELECT rowid FROM debug_sessions_fts WHERE code LIKE ?")
                 params.append(f"%{code}%")
 
             query = '''
@@ -98,7 +217,7 @@ class MemoryManager:
                 '''
 
             if query_conditions:
-                query += "WHERE " + " OR ".join(query_conditions)
+                query += "WHERE id IN (" + " UNION ".join(query_conditions) + ")"
 
             query += '''
                 ORDER BY 
@@ -113,7 +232,7 @@ class MemoryManager:
 
             for row in cursor.fetchall():
                 try:
-                    solution = json.loads(row[2])
+                    solution = orjson.loads(row[2])
                     patterns.append({
                         "code": row[0],
                         "error": row[1],
@@ -121,35 +240,35 @@ class MemoryManager:
                         "context": row[3],
                         "timestamp": row[4]
                     })
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     continue
 
             return patterns
 
         except Exception as e:
-            print(f"Error finding similar patterns: {e}")
+            logger.error("Error finding similar patterns: %s", e)
             return []
 
-    def _update_pattern_frequency(self, error: str):
-        """Update pattern frequency in the database"""
-        try:
-            cursor = self.db.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO patterns 
-                (pattern_type, description, frequency, last_seen)
-                VALUES (
-                    ?,
-                    ?,
-                    COALESCE((SELECT frequency + 1 FROM patterns WHERE pattern_type = ?), 1),
-                    ?
-                )
-            ''', (error, error, error, datetime.now().isoformat()))
+    def _update_pattern_frequency(self, errors: List[tuple]):
+        """Update pattern frequencies for (error, timestamp) pairs within the caller's transaction"""
+        self.cursor.executemany('''
+            INSERT INTO patterns (pattern_type, description, frequency, last_seen)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT(pattern_type) DO UPDATE SET
+                frequency = frequency + 1,
+                last_seen = excluded.last_seen
+        ''', [(error, error, timestamp) for error, timestamp in errors])
 
-            self.db.commit()
+    async def count_patterns(self) -> int:
+        """Count stored debug sessions"""
+        return await self._run_blocking(self._count_patterns)
 
+    def _count_patterns(self) -> int:
+        try:
+            return self.db.execute("SELECT COUNT(*) FROM debug_sessions").fetchone()[0]
         except Exception as e:
-            print(f"Error updating pattern frequency: {e}")
-            self.db.rollback()
+            logger.error("Error counting patterns: %s", e)
+            return 0
 
     def get_last_update_time(self) -> str:
         """Get the timestamp of the last update"""
@@ -158,7 +277,7 @@ class MemoryManager:
     def cleanup_old_sessions(self, days: int = 30):
         """Clean up old debug sessions"""
         try:
-            cursor = self.db.cursor()
+            cursor = self.cursor
             cursor.execute('''
                 DELETE FROM debug_sessions
                 WHERE datetime(timestamp) < datetime('now', ?)
@@ -167,12 +286,13 @@ class MemoryManager:
             self.db.commit()
 
         except Exception as e:
-            print(f"Error cleaning up old sessions: {e}")
+            logger.error("Error cleaning up old sessions: %s", e)
             self.db.rollback()
 
     def __del__(self):
         """Cleanup on deletion"""
         try:
+            self._executor.shutdown(wait=True)
             self.db.close()
         except:
             pass
\ No newline at end of file
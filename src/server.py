@@ -0,0 +1,35 @@
+import uvicorn
+
+from config.settings import settings
+from src.automation.browser_host import start_browser_host, stop_browser_host
+
+# Launches the API server: python -m src.server (start_assistant.py does this).
+# It stays separate from src.main so that processes spawned from here (the
+# browser host, uvicorn workers) don't build the app just by importing it.
+
+
+def main():
+    """Serve src.main:app until stopped, with a shared browser host for multiple workers"""
+    print("Starting AI Debug Assistant server...")
+    # With several workers, browsers live in one host process so every worker
+    # reuses the same running drivers instead of cold-starting its own. A
+    # single worker keeps them in-process (connect_browser_controller falls
+    # back to a local BrowserController when no host is published).
+    browser_host = start_browser_host() if settings.SERVER_WORKERS > 1 else None
+    try:
+        # Workers need the app as an import string; uvicorn picks uvloop and
+        # httptools automatically when they are installed (uvicorn[standard])
+        uvicorn.run(
+            "src.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=settings.SERVER_WORKERS,
+            log_level="warning"
+        )
+    finally:
+        if browser_host is not None:
+            stop_browser_host(browser_host)
+
+
+if __name__ == "__main__":
+    main()
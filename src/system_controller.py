@@ -1,25 +1,123 @@
 import subprocess
 import os
 import json
+import functools
 import winreg
 from typing import Dict, Any, List, Optional
 
+from src.utils.platform_info import get_os_build
+
+# Fallback commands when an app's executable can't be located
+DEFAULT_COMMANDS = {
+    "vscode": "code",
+    "chrome": "chrome",
+    "firefox": "firefox",
+    "explorer": "explorer",
+    "terminal": "wt"
+}
+
+# Executable paths found by earlier runs, keyed to the OS build they were found on
+APP_PATHS_CACHE = os.path.join(os.path.expanduser("~"), ".ai_debug_assistant", "app_paths.json")
+
+
+def _registry_app_path(executable: str) -> Optional[str]:
+    """Look up an executable under the registry's App Paths key"""
+    try:
+        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                             rf"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\{executable}")
+        path = winreg.QueryValue(key, None)
+        winreg.CloseKey(key)
+        if os.path.exists(path):
+            return path
+    except:
+        pass
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def find_vscode_path() -> str:
+    """Find VS Code installation path"""
+    possible_paths = [
+        r"C:\Program Files\Microsoft VS Code\Code.exe",
+        r"C:\Program Files (x86)\Microsoft VS Code\Code.exe",
+        r"C:\Users\%USERNAME%\AppData\Local\Programs\Microsoft VS Code\Code.exe"
+    ]
+
+    # Try registry first
+    path = _registry_app_path("Code.exe")
+    if path:
+        return path
+
+    # Try possible paths
+    for path in possible_paths:
+        expanded_path = os.path.expandvars(path)
+        if os.path.exists(expanded_path):
+            return expanded_path
+
+    return DEFAULT_COMMANDS["vscode"]
+
+
+@functools.lru_cache(maxsize=None)
+def find_chrome_path() -> str:
+    """Find Chrome installation path"""
+    return _registry_app_path("chrome.exe") or DEFAULT_COMMANDS["chrome"]
+
+
+@functools.lru_cache(maxsize=None)
+def find_firefox_path() -> str:
+    """Find Firefox installation path"""
+    return _registry_app_path("firefox.exe") or DEFAULT_COMMANDS["firefox"]
+
+
+APP_PATH_FINDERS = {
+    "vscode": find_vscode_path,
+    "chrome": find_chrome_path,
+    "firefox": find_firefox_path
+}
+
+
+def load_app_paths() -> Dict[str, str]:
+    """Resolve app executables, reusing paths cached by an earlier run when they still exist"""
+    os_build = get_os_build()
+    try:
+        with open(APP_PATHS_CACHE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        cached_paths = cache["paths"] if cache.get("os_build") == os_build else {}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        cached_paths = {}
+
+    app_paths = {}
+    for app, finder in APP_PATH_FINDERS.items():
+        path = cached_paths.get(app)
+        if not (isinstance(path, str) and os.path.exists(path)):
+            path = finder()
+        app_paths[app] = path
+
+    # Only real paths are cached, so an app installed later is still picked up
+    found_paths = {app: path for app, path in app_paths.items() if path != DEFAULT_COMMANDS[app]}
+    if found_paths != cached_paths:
+        try:
+            os.makedirs(os.path.dirname(APP_PATHS_CACHE), exist_ok=True)
+            tmp_path = APP_PATHS_CACHE + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"os_build": os_build, "paths": found_paths}, f, indent=4)
+            os.replace(tmp_path, APP_PATHS_CACHE)
+        except OSError:
+            pass
+
+    return app_paths
+
 
 class SystemController:
     def __init__(self):
         # Default commands for apps
-        self.default_commands = {
-            "vscode": "code",
-            "chrome": "chrome",
-            "firefox": "firefox",
-            "explorer": "explorer",
-            "terminal": "wt"
-        }
+        self.default_commands = dict(DEFAULT_COMMANDS)
 
         # Initialize paths
+        paths = load_app_paths()
         self.app_paths = {
             "vscode": {
-                "path": self._find_vscode_path(),
+                "path": paths["vscode"],
                 "command": "code",
                 "args": {
                     "new_window": "--new-window",
@@ -28,12 +126,12 @@ class SystemController:
                 }
             },
             "chrome": {
-                "path": self._find_chrome_path(),
+                "path": paths["chrome"],
                 "command": "chrome",
                 "args": {"incognito": "--incognito"}
             },
             "firefox": {
-                "path": self._find_firefox_path(),
+                "path": paths["firefox"],
                 "command": "firefox",
                 "args": {"private": "-private"}
             }
@@ -42,59 +140,6 @@ class SystemController:
         self.workspace_root = os.path.expanduser("~/workspace")
         self._ensure_directories()
 
-    def _find_vscode_path(self) -> str:
-        """Find VS Code installation path"""
-        possible_paths = [
-            r"C:\Program Files\Microsoft VS Code\Code.exe",
-            r"C:\Program Files (x86)\Microsoft VS Code\Code.exe",
-            r"C:\Users\%USERNAME%\AppData\Local\Programs\Microsoft VS Code\Code.exe"
-        ]
-
-        # Try registry first
-        try:
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                 r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\Code.exe")
-            path = winreg.QueryValue(key, None)
-            winreg.CloseKey(key)
-            if os.path.exists(path):
-                return path
-        except:
-            pass
-
-        # Try possible paths
-        for path in possible_paths:
-            expanded_path = os.path.expandvars(path)
-            if os.path.exists(expanded_path):
-                return expanded_path
-
-        return self.default_commands["vscode"]
-
-    def _find_chrome_path(self) -> str:
-        """Find Chrome installation path"""
-        try:
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                 r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\chrome.exe")
-            path = winreg.QueryValue(key, None)
-            winreg.CloseKey(key)
-            if os.path.exists(path):
-                return path
-        except:
-            pass
-        return self.default_commands["chrome"]
-
-    def _find_firefox_path(self) -> str:
-        """Find Firefox installation path"""
-        try:
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                 r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\firefox.exe")
-            path = winreg.QueryValue(key, None)
-            winreg.CloseKey(key)
-            if os.path.exists(path):
-                return path
-        except:
-            pass
-        return self.default_commands["firefox"]
-
     def _ensure_directories(self):
         """Ensure required directories exist"""
         os.makedirs(self.workspace_root, exist_ok=True)
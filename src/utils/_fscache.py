@@ -0,0 +1,86 @@
+import atexit
+import functools
+import itertools
+import os
+import threading
+from collections import OrderedDict
+
+import orjson
+
+# Results for files that have not changed since they were computed, kept across runs
+FSCACHE_PATH = os.path.join(os.path.expanduser("~"), ".ai_debug_assistant", "fscache.json")
+FSCACHE_MAX_ENTRIES = 4096
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_dirty = False
+
+
+def _load():
+    """Read the results saved by earlier runs"""
+    try:
+        with open(FSCACHE_PATH, 'rb') as f:
+            entries = orjson.loads(f.read())
+        for key, value in entries[-FSCACHE_MAX_ENTRIES:]:
+            _cache[tuple(key)] = value
+    except (OSError, ValueError, TypeError):
+        pass
+
+
+def _save():
+    """Write the cache back if this run added to it"""
+    if not _dirty:
+        return
+    try:
+        os.makedirs(os.path.dirname(FSCACHE_PATH), exist_ok=True)
+        tmp_path = f"{FSCACHE_PATH}.{os.getpid()}.tmp"
+        with _lock:
+            data = orjson.dumps([[list(key), value] for key, value in _cache.items()])
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, FSCACHE_PATH)
+    except OSError:
+        pass
+
+
+_load()
+atexit.register(_save)
+
+
+def _mtime_and_size(stats: os.stat_result) -> tuple:
+    return stats.st_mtime_ns, stats.st_size
+
+
+def memoize_stat(stat_key=_mtime_and_size):
+    """Reuse a function's result for a path while stat_key(os.stat(path)) is unchanged
+
+    Empty results (how the helpers report errors) are not cached. Cached results are
+    shared between callers, so treat them as read-only.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(path, *args, **kwargs):
+            global _dirty
+            try:
+                stats = os.stat(path)
+            except OSError:
+                return func(path, *args, **kwargs)
+
+            key = (func.__name__, os.path.abspath(path), *stat_key(stats), *args,
+                   *itertools.chain.from_iterable(sorted(kwargs.items())))
+            with _lock:
+                if key in _cache:
+                    _cache.move_to_end(key)
+                    return _cache[key]
+
+            result = func(path, *args, **kwargs)
+            if result:
+                with _lock:
+                    _cache[key] = result
+                    if len(_cache) > FSCACHE_MAX_ENTRIES:
+                        _cache.popitem(last=False)
+                    _dirty = True
+            return result
+
+        return wrapper
+    return decorator
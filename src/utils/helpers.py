@@ -1,16 +1,37 @@
 import os
 import re
+import shutil
 import json
+import orjson
 import time
 from typing import Dict, Any, Optional, List, Union
-from datetime import datetime
 import hashlib
 
+from src.utils._fscache import memoize_stat
+
+# Read size for hashing files on Pythons without hashlib.file_digest
+HASH_BLOCK_SIZE = 1 << 20
+
+# Default read size for chunked_read
+READ_CHUNK_SIZE = 1 << 20
+
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+BYTE_UNIT_SIZES = tuple(float(1 << (10 * i)) for i in range(len(BYTE_UNITS)))
+
+# Directories validate_file_path accepts, as (normalized dir, dir + separator)
+ALLOWED_PATH_PREFIXES = tuple(
+    (allowed, os.path.join(allowed, ''))
+    for allowed in (os.path.normcase(os.path.normpath(d)) for d in (os.path.expanduser('~'), '/tmp'))
+)
+
+# Anything but word characters, whitespace, hyphens and dots
+_UNSAFE_CHARS = re.compile(r'[^\w\s\-\.]')
+
 
 def sanitize_input(text: str) -> str:
     """Sanitize user input"""
     # Remove any potentially harmful characters
-    text = re.sub(r'[^\w\s\-\.]', '', text)
+    text = _UNSAFE_CHARS.sub('', text)
     return text.strip()
 
 
@@ -22,18 +43,24 @@ def format_error_message(error: Exception) -> str:
 def load_json_file(filepath: str) -> Optional[Dict]:
     """Load and parse JSON file"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     except Exception as e:
         print(f"Error loading JSON file: {e}")
         return None
 
 
-def save_json_file(data: Dict, filepath: str) -> bool:
-    """Save data to JSON file"""
+def save_json_file(data: Dict, filepath: str, indent: Optional[int] = None) -> bool:
+    """Save data to JSON file (compact unless an indent is given)"""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+        if indent in (None, 2):
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            # orjson only pretty-prints with two spaces
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=indent, ensure_ascii=False)
         return True
     except Exception as e:
         print(f"Error saving JSON file: {e}")
@@ -42,16 +69,19 @@ def save_json_file(data: Dict, filepath: str) -> bool:
 
 def format_timestamp(timestamp: float) -> str:
     """Format timestamp for display"""
-    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    # struct_time is far cheaper to build than a datetime
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
 
 
 def format_bytes(bytes: int) -> str:
     """Format bytes to human-readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes < 1024:
-            return f"{bytes:.2f} {unit}"
-        bytes /= 1024
-    return f"{bytes:.2f} PB"
+    if bytes < 1024:
+        return f"{bytes:.2f} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    unit = (int(bytes).bit_length() - 1) // 10
+    if unit >= len(BYTE_UNITS):
+        unit = len(BYTE_UNITS) - 1
+    return f"{bytes / BYTE_UNIT_SIZES[unit]:.2f} {BYTE_UNITS[unit]}"
 
 
 def check_file_exists(filepath: str) -> bool:
@@ -90,21 +120,20 @@ def get_file_info(filepath: str) -> Dict[str, Any]:
 def parse_command_args(command: str) -> Dict[str, Any]:
     """Parse command arguments"""
     args = {}
-    parts = command.split()
-
-    i = 0
-    while i < len(parts):
-        if parts[i].startswith('--'):
-            key = parts[i][2:]
-            if i + 1 < len(parts) and not parts[i + 1].startswith('--'):
-                args[key] = parts[i + 1]
-                i += 2
-            else:
+    # Flag still waiting to see whether a value follows it
+    key = None
+
+    for part in command.split():
+        if part.startswith('--'):
+            if key is not None:
                 args[key] = True
-                i += 1
-        else:
-            i += 1
+            key = part[2:]
+        elif key is not None:
+            args[key] = part
+            key = None
 
+    if key is not None:
+        args[key] = True
     return args
 
 
@@ -127,12 +156,16 @@ def format_duration(seconds: int) -> str:
     return " ".join(parts)
 
 
+@memoize_stat()
 def generate_file_hash(filepath: str, algorithm: str = 'sha256') -> Optional[str]:
     """Generate hash of file contents"""
     try:
         hash_obj = hashlib.new(algorithm)
         with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: reads into one reused buffer and hashes without the GIL
+                return hashlib.file_digest(f, lambda: hash_obj).hexdigest()
+            for chunk in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
                 hash_obj.update(chunk)
         return hash_obj.hexdigest()
     except Exception as e:
@@ -144,10 +177,12 @@ def merge_dicts(dict1: Dict, dict2: Dict) -> Dict:
     """Deep merge two dictionaries"""
     result = dict1.copy()
     for key, value in dict2.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_dicts(result[key], value)
-        else:
-            result[key] = value
+        # Only dict values can need a nested merge, so test the incoming side first
+        if isinstance(value, dict):
+            current = result.get(key)
+            if isinstance(current, dict):
+                value = merge_dicts(current, value)
+        result[key] = value
     return result
 
 
@@ -177,9 +212,9 @@ def validate_file_path(filepath: str) -> bool:
             return False
 
         # Check if path is within allowed directories
-        allowed_dirs = [os.path.expanduser('~'), '/tmp', './']
-        return any(os.path.commonpath([filepath, allowed]) == allowed
-                   for allowed in allowed_dirs)
+        filepath = os.path.normcase(os.path.normpath(filepath))
+        return any(filepath == allowed or filepath.startswith(prefix)
+                   for allowed, prefix in ALLOWED_PATH_PREFIXES)
     except Exception:
         return False
 
@@ -195,10 +230,11 @@ def format_list_for_display(items: List[Any], separator: str = ', ') -> str:
     return f"{separator.join(str(x) for x in items[:-1])} and {items[-1]}"
 
 
-def chunked_read(filepath: str, chunk_size: int = 8192) -> Union[str, bytes]:
+def chunked_read(filepath: str, chunk_size: int = READ_CHUNK_SIZE) -> Union[str, bytes]:
     """Read file in chunks to handle large files"""
     try:
-        with open(filepath, 'rb') as f:
+        # Unbuffered, so each chunk is read straight into the bytes object yielded
+        with open(filepath, 'rb', buffering=0) as f:
             while True:
                 chunk = f.read(chunk_size)
                 if not chunk:
@@ -209,6 +245,16 @@ def chunked_read(filepath: str, chunk_size: int = 8192) -> Union[str, bytes]:
         yield b""
 
 
+def copy_file(source: str, destination: str) -> bool:
+    """Copy a file's contents, letting the OS do the copy where it can (sendfile etc.)"""
+    try:
+        shutil.copyfile(source, destination)
+        return True
+    except Exception as e:
+        print(f"Error copying file: {e}")
+        return False
+
+
 def safe_delete(filepath: str) -> bool:
     """Safely delete a file with error handling"""
     try:
@@ -227,9 +273,17 @@ def get_unique_filename(filepath: str) -> str:
         return filepath
 
     base, ext = os.path.splitext(filepath)
+    # List the directory once instead of probing each candidate on disk
+    directory, name = os.path.split(base)
+    try:
+        with os.scandir(directory or '.') as entries:
+            taken = {os.path.normcase(entry.name) for entry in entries}
+    except OSError:
+        taken = set()
+
     counter = 1
     while True:
-        new_filepath = f"{base}_{counter}{ext}"
-        if not os.path.exists(new_filepath):
-            return new_filepath
+        new_name = f"{name}_{counter}{ext}"
+        if os.path.normcase(new_name) not in taken:
+            return f"{base}_{counter}{ext}"
         counter += 1
\ No newline at end of file
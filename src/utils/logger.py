@@ -1,6 +1,9 @@
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 
@@ -33,9 +36,15 @@ class Logger:
             console_handler.setLevel(logging.INFO)
             console_handler.setFormatter(formatter)
 
+            # Write records from a background thread; callers only enqueue them
+            log_queue = queue.SimpleQueue()
+            self._listener = QueueListener(log_queue, file_handler, console_handler,
+                                           respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self._listener.stop)
+
             # Add handlers to logger
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            self.logger.addHandler(QueueHandler(log_queue))
             self.logger.setLevel(logging.DEBUG)
 
         except Exception as e:
@@ -69,4 +78,23 @@ class Logger:
 
 def setup_logger(name: str, log_dir: Optional[str] = None) -> Logger:
     """Create and return a logger instance"""
-    return Logger(name, log_dir)
\ No newline at end of file
+    return Logger(name, log_dir)
+
+
+def setup_queue_logging(name: str = "src", level: int = logging.INFO,
+                        fmt: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s') -> QueueListener:
+    """Hand records for a logger tree to a background thread for formatting and output"""
+    log_queue = queue.SimpleQueue()
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(fmt))
+
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    target = logging.getLogger(name)
+    target.addHandler(QueueHandler(log_queue))
+    target.setLevel(level)
+    target.propagate = False
+    return listener
\ No newline at end of file
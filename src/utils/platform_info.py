@@ -0,0 +1,11 @@
+import functools
+import os
+import sys
+
+
+@functools.lru_cache(maxsize=None)
+def get_os_build() -> str:
+    """Identify the running OS build without going through platform's WMI/uname queries"""
+    if hasattr(sys, "getwindowsversion"):
+        return ".".join(map(str, tuple(sys.getwindowsversion())[:4]))
+    return os.uname().version
@@ -0,0 +1,25 @@
+from typing import Iterable
+import re
+
+
+def literal_trie_pattern(literals: Iterable[str]) -> str:
+    """Fold literal strings into a character trie and emit it as one regex
+
+    The engine then follows a single branch per position and prefers the
+    longest literal, instead of trying every alternative in turn.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if '' in node else body
+
+    return emit(trie)
@@ -6,10 +6,149 @@ import cv2
 import win32gui
 import win32con
 import win32ui
+import ctypes
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from ctypes import wintypes
+from concurrent.futures import Future, ProcessPoolExecutor
 from typing import Tuple, Optional
 
+logger = logging.getLogger(__name__)
+
+# Worker processes kept alive for OCR so captures overlap with recognition
+OCR_POOL_SIZE = 2
+
+# A capture of the same window younger than this is reused (e.g. "read screen" then "read code")
+CAPTURE_TTL = 0.5
+
+# OCR results remembered for frames seen before, keyed by a digest of their pixels
+OCR_CACHE_SIZE = 128
+
+# Tesseract settings; code keeps runs of spaces so indentation survives
+OCR_TEXT_CONFIG = r'--oem 3 --psm 6'
+OCR_CODE_CONFIG = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
+
+# Frames wider than this are shrunk before OCR; Tesseract time scales with pixel count
+OCR_MAX_WIDTH = 1500
+OCR_DOWNSCALE = 0.75
+
+# Common editor titles, in order of preference
+EDITOR_TITLES = (
+    "Visual Studio Code",
+    "- Visual Studio Code",
+    "VSCodium",
+    "Sublime Text",
+    "PyCharm",
+    "IntelliJ IDEA"
+)
+
+# Grayscale buffer reused between frames of the same size, one per thread
+_ocr_buffers = threading.local()
+
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", wintypes.DWORD),
+        ("biWidth", wintypes.LONG),
+        ("biHeight", wintypes.LONG),
+        ("biPlanes", wintypes.WORD),
+        ("biBitCount", wintypes.WORD),
+        ("biCompression", wintypes.DWORD),
+        ("biSizeImage", wintypes.DWORD),
+        ("biXPelsPerMeter", wintypes.LONG),
+        ("biYPelsPerMeter", wintypes.LONG),
+        ("biClrUsed", wintypes.DWORD),
+        ("biClrImportant", wintypes.DWORD),
+    ]
+
+
+def _ocr_worker(img_np: np.ndarray, is_code: bool, color_conversion: Optional[int] = None,
+                downscale: bool = True) -> str:
+    """Preprocess a frame and run Tesseract over it
+
+    Pass the cv2 conversion for colour frames; without one the frame must already be a
+    writable grayscale array. With downscale, frames wider than OCR_MAX_WIDTH are shrunk.
+    """
+    try:
+        if downscale and img_np.shape[1] > OCR_MAX_WIDTH:
+            img_np = cv2.resize(img_np, None, fx=OCR_DOWNSCALE, fy=OCR_DOWNSCALE,
+                                interpolation=cv2.INTER_AREA)
+
+        # Convert to grayscale
+        if color_conversion is None:
+            gray = img_np
+        else:
+            gray = getattr(_ocr_buffers, "gray", None)
+            if gray is None or gray.shape != img_np.shape[:2]:
+                gray = _ocr_buffers.gray = np.empty(img_np.shape[:2], dtype=np.uint8)
+            cv2.cvtColor(img_np, color_conversion, dst=gray)
+
+        # Apply thresholding for better text detection (in place)
+        _, threshold = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=gray)
+
+        # Use different OCR configs for code vs regular text
+        custom_config = OCR_CODE_CONFIG if is_code else OCR_TEXT_CONFIG
+
+        # Perform OCR
+        text = pytesseract.image_to_string(threshold, config=custom_config,
+                                           output_type=pytesseract.Output.STRING)
+        return text.strip()
+    except Exception as e:
+        print(f"Error reading text: {e}")
+        return ""
+
 
 class ScreenReader:
+    _ocr_pool: Optional[ProcessPoolExecutor] = None
+    # Handle of the editor window read last time
+    _editor_hwnd: Optional[int] = None
+    # (window title, monotonic time, read-only BGRA pixels) of the latest capture
+    _last_capture: Tuple = (None, float("-inf"), None)
+    _ocr_cache: OrderedDict = OrderedDict()
+    _ocr_cache_lock = threading.Lock()
+
+    @classmethod
+    def _cached_text(cls, key: tuple) -> Optional[str]:
+        """Return the OCR text stored for key, if any"""
+        with cls._ocr_cache_lock:
+            text = cls._ocr_cache.get(key)
+            if text is not None:
+                cls._ocr_cache.move_to_end(key)
+        logger.debug("OCR cache %s", "hit" if text is not None else "miss")
+        return text
+
+    @classmethod
+    def _remember_text(cls, key: tuple, text: str):
+        """Store OCR text for key; empty results (also what errors return) are not kept"""
+        if not text:
+            return
+        with cls._ocr_cache_lock:
+            cls._ocr_cache[key] = text
+            if len(cls._ocr_cache) > OCR_CACHE_SIZE:
+                cls._ocr_cache.popitem(last=False)
+
+    @classmethod
+    def _get_ocr_pool(cls) -> ProcessPoolExecutor:
+        """Create the OCR worker pool on first use"""
+        if cls._ocr_pool is None:
+            cls._ocr_pool = ProcessPoolExecutor(max_workers=OCR_POOL_SIZE)
+        return cls._ocr_pool
+
+    @staticmethod
+    def is_available() -> bool:
+        """Cheap check that window capture can work, without grabbing anything"""
+        try:
+            return bool(win32gui.GetDesktopWindow())
+        except Exception as e:
+            print(f"Error checking screen access: {e}")
+            return False
+
     @staticmethod
     def get_window_rect(window_title: str) -> Optional[Tuple[int, int, int, int]]:
         """Get coordinates of a window by title"""
@@ -24,9 +163,14 @@ class ScreenReader:
             return None
 
     @staticmethod
-    def capture_window(window_title: str) -> Optional[Image.Image]:
-        """Capture specific window content"""
+    def capture_window_array(window_title: str) -> Optional[np.ndarray]:
+        """Capture specific window content as a top-down, read-only BGRA array"""
         try:
+            now = time.monotonic()
+            title, taken, pixels = ScreenReader._last_capture
+            if title == window_title and now - taken < CAPTURE_TTL:
+                return pixels
+
             # Get window handle
             hwnd = win32gui.FindWindow(None, window_title)
             if not hwnd:
@@ -49,87 +193,142 @@ class ScreenReader:
 
             # Copy window content
             saveDC.BitBlt((0, 0), (width, height), mfcDC, (0, 0), win32con.SRCCOPY)
+            # GetDIBits needs the bitmap deselected, which deleting its DC does
+            saveDC.DeleteDC()
 
-            # Convert to PIL Image
-            bmpinfo = saveBitMap.GetInfo()
-            bmpstr = saveBitMap.GetBitmapBits(True)
-            im = Image.frombuffer(
-                'RGB',
-                (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                bmpstr, 'raw', 'BGRX', 0, 1)
+            # Read the pixels straight into the array (negative height = top-down rows)
+            header = BITMAPINFOHEADER(
+                biSize=ctypes.sizeof(BITMAPINFOHEADER),
+                biWidth=width,
+                biHeight=-height,
+                biPlanes=1,
+                biBitCount=32,
+                biCompression=BI_RGB
+            )
+            pixels = np.empty((height, width, 4), dtype=np.uint8)
+            rows = ctypes.windll.gdi32.GetDIBits(
+                mfcDC.GetSafeHdc(), saveBitMap.GetHandle(), 0, height,
+                pixels.ctypes.data_as(ctypes.c_void_p), ctypes.byref(header), DIB_RGB_COLORS)
 
             # Cleanup
             win32gui.DeleteObject(saveBitMap.GetHandle())
-            saveDC.DeleteDC()
             mfcDC.DeleteDC()
             win32gui.ReleaseDC(hwnd, hwndDC)
 
-            return im
+            if rows != height:
+                return None
+            # Shared with anyone reusing this capture, so nobody may write to it
+            pixels.flags.writeable = False
+            ScreenReader._last_capture = (window_title, now, pixels)
+            return pixels
         except Exception as e:
             print(f"Error capturing window: {e}")
             return None
 
     @staticmethod
-    def read_text_from_image(image: Image.Image, is_code: bool = False) -> str:
-        """Extract text from image"""
-        try:
-            # Convert to numpy array
-            img_np = np.array(image)
-
-            # Convert to grayscale
-            gray = cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
+    def capture_window(window_title: str) -> Optional[Image.Image]:
+        """Capture specific window content"""
+        pixels = ScreenReader.capture_window_array(window_title)
+        if pixels is None:
+            return None
+        height, width = pixels.shape[:2]
+        return Image.frombuffer('RGB', (width, height), pixels, 'raw', 'BGRX', 0, 1)
 
-            # Apply thresholding for better text detection
-            _, threshold = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    @staticmethod
+    def capture_window_gray(window_title: str) -> Optional[Image.Image]:
+        """Capture window content as 8-bit grayscale, the form OCR reads it in"""
+        pixels = ScreenReader.capture_window_array(window_title)
+        if pixels is None:
+            return None
+        return Image.fromarray(cv2.cvtColor(pixels, cv2.COLOR_BGRA2GRAY))
 
-            # Use different OCR configs for code vs regular text
-            if is_code:
-                custom_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
-            else:
-                custom_config = r'--oem 3 --psm 6'
+    @staticmethod
+    def read_text_from_image(image: Image.Image, is_code: bool = False, scale: Optional[float] = None) -> str:
+        """Extract text from image, optionally resized by scale first (e.g. 0.5 for large UI text)"""
+        try:
+            key = (hashlib.sha1(image.tobytes()).digest(), image.mode, image.size, is_code, scale)
+            text = ScreenReader._cached_text(key)
+            if text is not None:
+                return text
 
-            # Perform OCR
-            text = pytesseract.image_to_string(threshold, config=custom_config)
-            return text.strip()
+            # PIL converts straight to 8-bit luma, skipping a full RGB array copy
+            gray = image if image.mode == 'L' else image.convert('L')
+            if scale is not None:
+                width, height = gray.size
+                gray = gray.resize((max(1, int(width * scale)), max(1, int(height * scale))), Image.BILINEAR)
+            text = _ocr_worker(np.array(gray), is_code, downscale=scale is None)
+            ScreenReader._remember_text(key, text)
+            return text
         except Exception as e:
             print(f"Error reading text: {e}")
             return ""
 
     @staticmethod
-    def read_code_from_editor() -> str:
-        """Read code from active editor window"""
+    def _submit_editor_capture(full_title: str) -> Optional[Future]:
+        """Capture an editor window and queue it for OCR"""
+        pixels = ScreenReader.capture_window_array(full_title)
+        if pixels is None:
+            return None
+
+        key = (hashlib.sha1(pixels).digest(), pixels.shape, "editor")
+        text = ScreenReader._cached_text(key)
+        if text is not None:
+            done = Future()
+            done.set_result(text)
+            return done
+
+        def remember(finished: Future):
+            if not finished.cancelled() and finished.exception() is None:
+                ScreenReader._remember_text(key, finished.result())
+
+        future = ScreenReader._get_ocr_pool().submit(_ocr_worker, pixels, True, cv2.COLOR_BGRA2GRAY)
+        future.add_done_callback(remember)
+        return future
+
+    @staticmethod
+    def read_code_from_editor_async() -> Future:
+        """Capture the active editor window and OCR it in the worker pool"""
         try:
-            # Common editor titles
-            editor_titles = [
-                "Visual Studio Code",
-                "- Visual Studio Code",
-                "VSCodium",
-                "Sublime Text",
-                "PyCharm",
-                "IntelliJ IDEA"
-            ]
+            # Try the editor window found last time before enumerating again
+            hwnd = ScreenReader._editor_hwnd
+            if hwnd and win32gui.IsWindow(hwnd) and win32gui.IsWindowVisible(hwnd):
+                full_title = win32gui.GetWindowText(hwnd)
+                if any(title in full_title for title in EDITOR_TITLES):
+                    future = ScreenReader._submit_editor_capture(full_title)
+                    if future:
+                        return future
+
+            # Collect visible windows in one pass
+            def callback(hwnd, windows):
+                if win32gui.IsWindowVisible(hwnd):
+                    windows.append((hwnd, win32gui.GetWindowText(hwnd)))
+                return True
+
+            windows = []
+            win32gui.EnumWindows(callback, windows)
 
             # Try to find and capture editor window
-            for title in editor_titles:
-                # Find windows that contain the title
-                def callback(hwnd, windows):
-                    if win32gui.IsWindowVisible(hwnd):
-                        window_text = win32gui.GetWindowText(hwnd)
-                        if title in window_text:
-                            windows.append((hwnd, window_text))
-                    return True
-
-                windows = []
-                win32gui.EnumWindows(callback, windows)
-
-                if windows:
-                    # Use the first matching window
-                    hwnd, full_title = windows[0]
-                    image = ScreenReader.capture_window(full_title)
-                    if image:
-                        return ScreenReader.read_text_from_image(image, is_code=True)
+            for title in EDITOR_TITLES:
+                for hwnd, full_title in windows:
+                    if title in full_title:
+                        # Use the first matching window
+                        future = ScreenReader._submit_editor_capture(full_title)
+                        if future:
+                            ScreenReader._editor_hwnd = hwnd
+                            return future
+                        break
+        except Exception as e:
+            print(f"Error reading code: {e}")
 
-            return ""
+        done = Future()
+        done.set_result("")
+        return done
+
+    @staticmethod
+    def read_code_from_editor() -> str:
+        """Read code from active editor window"""
+        try:
+            return ScreenReader.read_code_from_editor_async().result()
         except Exception as e:
             print(f"Error reading code: {e}")
             return ""
\ No newline at end of file
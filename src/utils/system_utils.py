@@ -1,4 +1,6 @@
 import os
+import functools
+import json
 import psutil
 import platform
 import shutil
@@ -8,24 +10,89 @@ import logging
 import time
 from datetime import datetime
 
+from src.utils.platform_info import get_os_build
+
 logger = logging.getLogger(__name__)
 
+# Root of the current drive, e.g. C:\ on Windows
+ROOT_PATH = os.path.abspath(os.sep)
+
+# Telemetry readings younger than this are served from cache
+TELEMETRY_TTL = 0.5
+
+# cpu_percent(interval=None) reports usage since the previous call; this first
+# call starts the clock so get_cpu_usage never has to block sampling
+psutil.cpu_percent(interval=None)
+
+
+def ttl_cache(seconds: float):
+    """Reuse a function's result per argument tuple for the given number of seconds
+
+    Cached results are shared between callers, so treat them as read-only.
+    """
+    def decorator(func):
+        results = {}
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            cached = results.get(args)
+            if cached is None or now - cached[0] > seconds:
+                cached = results[args] = (now, func(*args))
+            return cached[1]
+
+        return wrapper
+    return decorator
+
+
+# OS and hardware details recorded by an earlier run, keyed to the OS build
+SYSTEM_INFO_CACHE = os.path.join(os.path.expanduser("~"), ".ai_debug_assistant", "sysinfo.json")
+PLATFORM_INFO_KEYS = ("os", "os_version", "machine", "processor")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_platform_info() -> Dict:
+    """Get OS and processor details, which only change with the OS build"""
+    os_build = get_os_build()
+    try:
+        with open(SYSTEM_INFO_CACHE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache["os_build"] == os_build and tuple(cache["platform"]) == PLATFORM_INFO_KEYS:
+            return cache["platform"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    info = {
+        "os": platform.system(),
+        "os_version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor()
+    }
+    try:
+        os.makedirs(os.path.dirname(SYSTEM_INFO_CACHE), exist_ok=True)
+        tmp_path = SYSTEM_INFO_CACHE + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"os_build": os_build, "platform": info}, f, indent=4)
+        os.replace(tmp_path, SYSTEM_INFO_CACHE)
+    except OSError:
+        pass
+    return info
+
 
 def get_system_info() -> Dict:
     """Get system information"""
     try:
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(ROOT_PATH)
         return {
-            "os": platform.system(),
-            "os_version": platform.version(),
-            "machine": platform.machine(),
-            "processor": platform.processor(),
+            **_get_platform_info(),
             "memory": {
-                "total": psutil.virtual_memory().total,
-                "available": psutil.virtual_memory().available
+                "total": memory.total,
+                "available": memory.available
             },
             "disk": {
-                "total": psutil.disk_usage('/').total,
-                "free": psutil.disk_usage('/').free
+                "total": disk.total,
+                "free": disk.free
             }
         }
     except Exception as e:
@@ -77,13 +144,29 @@ def create_directory_structure(base_path: str, structure: List[str]) -> bool:
         return False
 
 
+# How long one walk of the process table answers name lookups
+PROCESS_SNAPSHOT_TTL = 0.5
+
+_process_snapshot = {"taken": float("-inf"), "processes": []}
+
+
+def _get_process_snapshot() -> List:
+    """Return (lowercased name, process) pairs, walking the process table at most once per TTL"""
+    now = time.monotonic()
+    if now - _process_snapshot["taken"] > PROCESS_SNAPSHOT_TTL:
+        _process_snapshot["processes"] = [
+            ((proc.info['name'] or '').lower(), proc)
+            for proc in psutil.process_iter(['name'])
+        ]
+        _process_snapshot["taken"] = now
+    return _process_snapshot["processes"]
+
+
 def is_process_running(process_name: str) -> bool:
     """Check if a process is running"""
     try:
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'].lower() == process_name.lower():
-                return True
-        return False
+        target = process_name.lower()
+        return any(name == target for name, _ in _get_process_snapshot())
     except Exception as e:
         logger.error(f"Error checking process {process_name}: {e}")
         return False
@@ -92,17 +175,23 @@ def is_process_running(process_name: str) -> bool:
 def kill_process(process_name: str) -> bool:
     """Kill a process by name"""
     try:
+        target = process_name.lower()
         killed = False
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'].lower() == process_name.lower():
+        for name, proc in _get_process_snapshot():
+            if name == target:
+                # psutil refuses to kill if the pid has since been reused
                 proc.kill()
                 killed = True
         return killed
     except Exception as e:
         logger.error(f"Error killing process {process_name}: {e}")
         return False
+    finally:
+        # The snapshot no longer reflects what is running
+        _process_snapshot["taken"] = float("-inf")
 
 
+@ttl_cache(TELEMETRY_TTL)
 def get_memory_usage() -> Dict:
     """Get detailed memory usage information"""
     try:
@@ -129,6 +218,7 @@ def get_memory_usage() -> Dict:
         return {}
 
 
+@ttl_cache(TELEMETRY_TTL)
 def get_disk_usage(path: str = "/") -> Dict:
     """Get disk usage information"""
     try:
@@ -144,6 +234,7 @@ def get_disk_usage(path: str = "/") -> Dict:
         return {}
 
 
+@ttl_cache(TELEMETRY_TTL)
 def get_network_info() -> Dict:
     """Get network information"""
     try:
@@ -162,19 +253,21 @@ def get_network_info() -> Dict:
         return {}
 
 
+@ttl_cache(TELEMETRY_TTL)
 def get_cpu_usage() -> Dict:
-    """Get CPU usage information"""
+    """Get CPU usage information (percent is measured since the previous call)"""
     try:
+        frequency = psutil.cpu_freq()
         return {
-            "percent": psutil.cpu_percent(interval=1),
+            "percent": psutil.cpu_percent(interval=None),
             "count": {
                 "physical": psutil.cpu_count(logical=False),
                 "logical": psutil.cpu_count(logical=True)
             },
             "frequency": {
-                "current": psutil.cpu_freq().current,
-                "min": psutil.cpu_freq().min,
-                "max": psutil.cpu_freq().max
+                "current": frequency.current,
+                "min": frequency.min,
+                "max": frequency.max
             }
         }
     except Exception as e:
@@ -182,6 +275,7 @@ def get_cpu_usage() -> Dict:
         return {}
 
 
+@ttl_cache(TELEMETRY_TTL)
 def get_battery_info() -> Dict:
     """Get battery information if available"""
     try:
@@ -243,7 +337,7 @@ def check_system_requirements() -> Dict:
     """Check if system meets minimum requirements"""
     try:
         memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        disk = psutil.disk_usage(ROOT_PATH)
         cpu_count = psutil.cpu_count()
 
         requirements = {
@@ -3,7 +3,60 @@ import threading
 import queue
 import keyboard
 import re
-from typing import List
+import functools
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sentence boundaries: whitespace following terminal punctuation
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Pending utterances kept before the oldest is dropped, so speech stays near real time
+SPEECH_QUEUE_SIZE = 32
+
+# Volume/rate hotkey steps; repeated presses are applied together at most this often (seconds)
+VOLUME_STEP = 0.1
+RATE_STEP = 25
+MIN_RATE = 50
+ADJUST_INTERVAL = 0.1
+
+# Sentences longer than this are split further, into pieces of about TARGET_CHUNK_LENGTH
+LONG_SENTENCE_LENGTH = 100
+TARGET_CHUNK_LENGTH = 80
+
+
+@functools.lru_cache(maxsize=512)
+def _compute_chunks(text: str) -> Tuple[str, ...]:
+    """Break text into smaller, natural chunks (cached, as status lines repeat a lot)"""
+    # Split by sentences first
+    chunks = _SENT_SPLIT.split(text)
+
+    # Further split long sentences
+    final_chunks = []
+    for chunk in chunks:
+        if len(chunk) > LONG_SENTENCE_LENGTH:  # If chunk is too long
+            words = chunk.split()
+            sub_chunks = []
+            current_chunk = []
+            # Length of ' '.join(current_chunk), kept without re-joining
+            current_length = -1
+
+            for word in words:
+                current_chunk.append(word)
+                current_length += len(word) + 1
+                if current_length > TARGET_CHUNK_LENGTH:  # Target chunk size
+                    sub_chunks.append(' '.join(current_chunk))
+                    current_chunk = []
+                    current_length = -1
+
+            if current_chunk:
+                sub_chunks.append(' '.join(current_chunk))
+            final_chunks.extend(sub_chunks)
+        else:
+            final_chunks.append(chunk)
+
+    return tuple(final_chunks)
 
 
 class EnhancedVoiceManager:
@@ -12,12 +65,25 @@ class EnhancedVoiceManager:
         self.engine = pyttsx3.init()
         self.engine.setProperty('rate', 150)  # Speaking rate
         self.engine.setProperty('volume', 0.9)  # Volume level
+        # Installed voices, enumerated once (the driver rescans them on every query)
+        self._voices = self.engine.getProperty('voices') or []
 
         # State management
         self.speaking = False
-        self.paused = False
-        self.speech_queue = queue.Queue()
+        self._paused = False
+        # Notified whenever paused changes, so the worker can sleep until resumed
+        self._state_changed = threading.Condition()
+        self.speech_queue = queue.Queue(maxsize=SPEECH_QUEUE_SIZE)
         self.stop_speaking = threading.Event()
+        # True only while the worker is inside engine.runAndWait(), the one time stop() has work to do
+        self._in_run_and_wait = False
+
+        # Hotkey volume/rate steps waiting to be applied, and the timer that will apply them
+        self._adjust_lock = threading.Lock()
+        self._pending_steps = {'volume': 0, 'rate': 0}
+        self._adjust_timers = {}
+
+        self.engine.connect('started-utterance', self._on_utterance_started)
 
         # Start speech thread
         self.speech_thread = threading.Thread(target=self._speech_worker, daemon=True)
@@ -26,6 +92,16 @@ class EnhancedVoiceManager:
         # Set up keyboard shortcuts
         self._setup_hotkeys()
 
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @paused.setter
+    def paused(self, value: bool):
+        with self._state_changed:
+            self._paused = value
+            self._state_changed.notify_all()
+
     def _setup_hotkeys(self):
         """Setup keyboard shortcuts for voice control"""
         try:
@@ -36,160 +112,182 @@ class EnhancedVoiceManager:
             keyboard.add_hotkey('ctrl+shift+left', self.decrease_rate)  # Slow down
             keyboard.add_hotkey('ctrl+shift+right', self.increase_rate)  # Speed up
         except Exception as e:
-            print(f"Error setting up hotkeys: {e}")
+            logger.error("Error setting up hotkeys: %s", e)
 
     def _speech_worker(self):
         """Background worker for speech processing"""
         while True:
             try:
-                text = self.speech_queue.get()
-                if text is None:  # Shutdown signal
+                item = self.speech_queue.get()
+                if item is None:  # Shutdown signal
                     break
+                text, chunked = item
 
                 self.speaking = True
                 self.stop_speaking.clear()
 
                 # Break text into smaller chunks for better interrupt response
-                chunks = self._chunk_text(text)
-
-                for chunk in chunks:
-                    # Check if paused
-                    while self.paused:
-                        if self.stop_speaking.is_set():
-                            break
-                        threading.Event().wait(0.1)
+                chunks = self._chunk_text(text) if chunked else [text]
 
-                    # Check if stopped
-                    if self.stop_speaking.is_set():
-                        break
+                # Wait while paused, unless told to stop
+                with self._state_changed:
+                    self._state_changed.wait_for(
+                        lambda: not self._paused or self.stop_speaking.is_set())
 
-                    # Speak the chunk
-                    self.engine.say(chunk)
-                    self.engine.runAndWait()
+                # Queue every chunk and run the engine once; an interrupt stops it
+                # mid-utterance, and _on_utterance_started catches one that lands in between
+                if not self.stop_speaking.is_set():
+                    for chunk in chunks:
+                        self.engine.say(chunk)
+                    self._in_run_and_wait = True
+                    try:
+                        self.engine.runAndWait()
+                    finally:
+                        self._in_run_and_wait = False
 
                 self.speaking = False
 
             except Exception as e:
-                print(f"Speech error: {e}")
+                logger.error("Speech error: %s", e)
                 self.speaking = False
 
+    def _on_utterance_started(self, name):
+        """Engine callback: drop the rest of the queued chunks once speech is interrupted"""
+        if self.stop_speaking.is_set():
+            self.engine.stop()
+
     def _chunk_text(self, text: str) -> List[str]:
         """Break text into smaller, natural chunks"""
-        # Split by sentences first
-        chunks = re.split(r'(?<=[.!?])\s+', text)
-
-        # Further split long sentences
-        final_chunks = []
-        for chunk in chunks:
-            if len(chunk) > 100:  # If chunk is too long
-                words = chunk.split()
-                sub_chunks = []
-                current_chunk = []
-
-                for word in words:
-                    current_chunk.append(word)
-                    if len(' '.join(current_chunk)) > 80:  # Target chunk size
-                        sub_chunks.append(' '.join(current_chunk))
-                        current_chunk = []
-
-                if current_chunk:
-                    sub_chunks.append(' '.join(current_chunk))
-                final_chunks.extend(sub_chunks)
-            else:
-                final_chunks.append(chunk)
+        return list(_compute_chunks(text))
 
-        return final_chunks
-
-    def speak(self, text: str):
-        """Add text to speech queue"""
+    def speak(self, text: str, chunked: bool = True):
+        """Add text to speech queue; unchunked text is spoken in one engine call"""
         if text:
-            print("\n🤖 Assistant:", text)
-            self.speech_queue.put(text)
+            logger.info("\n🤖 Assistant: %s", text)
+            item = (text, chunked)
+            # A repeat of the utterance still waiting at the back of the queue
+            # ("Opened VS Code" twice in a row) is only spoken once
+            with self.speech_queue.mutex:
+                pending = self.speech_queue.queue
+                if pending and pending[-1] == item:
+                    return
+            self._enqueue(item)
+
+    def _enqueue(self, item):
+        """Queue an item for the speech worker, dropping the oldest one if the backlog is full"""
+        while True:
+            try:
+                self.speech_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = self.speech_queue.get_nowait()
+                    logger.warning("Speech backlog full, skipped: %s", dropped[0])
+                except queue.Empty:
+                    pass
 
     def interrupt_speech(self):
         """Interrupt current speech"""
         if self.speaking:
             self.stop_speaking.set()
             self.paused = True
-            try:
-                self.engine.stop()
-            except:
-                pass
+            if self._in_run_and_wait:
+                try:
+                    self.engine.stop()
+                except:
+                    pass
             self.speaking = False
-            print("\nSpeech interrupted!")
+            logger.info("\nSpeech interrupted!")
 
     def resume_speech(self):
         """Resume speech from where it was paused"""
         if self.paused:
             self.paused = False
-            print("\nSpeech resumed!")
+            logger.info("\nSpeech resumed!")
 
     def increase_volume(self):
         """Increase speech volume"""
-        try:
-            current = self.engine.getProperty('volume')
-            new_volume = min(1.0, current + 0.1)
-            self.engine.setProperty('volume', new_volume)
-            print(f"\nVolume increased to {int(new_volume * 100)}%")
-        except Exception as e:
-            print(f"Error adjusting volume: {e}")
+        self._queue_adjustment('volume', 1)
 
     def decrease_volume(self):
         """Decrease speech volume"""
-        try:
-            current = self.engine.getProperty('volume')
-            new_volume = max(0.0, current - 0.1)
-            self.engine.setProperty('volume', new_volume)
-            print(f"\nVolume decreased to {int(new_volume * 100)}%")
-        except Exception as e:
-            print(f"Error adjusting volume: {e}")
+        self._queue_adjustment('volume', -1)
 
     def increase_rate(self):
         """Increase speech rate"""
-        try:
-            current = self.engine.getProperty('rate')
-            new_rate = current + 25
-            self.engine.setProperty('rate', new_rate)
-            print(f"\nSpeech rate increased to {new_rate}")
-        except Exception as e:
-            print(f"Error adjusting rate: {e}")
+        self._queue_adjustment('rate', 1)
 
     def decrease_rate(self):
         """Decrease speech rate"""
+        self._queue_adjustment('rate', -1)
+
+    def _queue_adjustment(self, setting: str, steps: int):
+        """Collect volume/rate steps and apply them together at most every ADJUST_INTERVAL"""
+        with self._adjust_lock:
+            self._pending_steps[setting] += steps
+            if setting not in self._adjust_timers:
+                timer = threading.Timer(ADJUST_INTERVAL, self._apply_adjustment, args=(setting,))
+                timer.daemon = True
+                self._adjust_timers[setting] = timer
+                timer.start()
+
+    def _apply_adjustment(self, setting: str):
+        """Apply the steps collected for a setting with one read and one write of the engine"""
+        with self._adjust_lock:
+            steps = self._pending_steps[setting]
+            self._pending_steps[setting] = 0
+            del self._adjust_timers[setting]
+        if not steps:
+            return
+
+        direction = "increased" if steps > 0 else "decreased"
         try:
-            current = self.engine.getProperty('rate')
-            new_rate = max(50, current - 25)
-            self.engine.setProperty('rate', new_rate)
-            print(f"\nSpeech rate decreased to {new_rate}")
+            current = self.engine.getProperty(setting)
+            if setting == 'volume':
+                new_volume = min(1.0, max(0.0, current + steps * VOLUME_STEP))
+                self.engine.setProperty('volume', new_volume)
+                logger.info("\nVolume %s to %d%%", direction, int(new_volume * 100))
+            else:
+                new_rate = max(MIN_RATE, current + steps * RATE_STEP)
+                self.engine.setProperty('rate', new_rate)
+                logger.info("\nSpeech rate %s to %s", direction, new_rate)
         except Exception as e:
-            print(f"Error adjusting rate: {e}")
+            logger.error("Error adjusting %s: %s", setting, e)
 
     def shutdown(self):
         """Clean shutdown of voice manager"""
         self.interrupt_speech()
-        self.speech_queue.put(None)  # Signal thread to stop
+        self._enqueue(None)  # Signal thread to stop
         if self.speech_thread.is_alive():
             self.speech_thread.join(timeout=1)
+        if self._in_run_and_wait:
+            try:
+                self.engine.stop()
+            except:
+                pass
+
+    def refresh_voices(self):
+        """Re-read the installed voices, e.g. after adding one"""
         try:
-            self.engine.stop()
-        except:
-            pass
+            self._voices = self.engine.getProperty('voices') or []
+        except Exception as e:
+            logger.error("Error refreshing voices: %s", e)
 
     def set_voice(self, voice_id=None):
         """Set a specific voice (if available)"""
         try:
-            voices = self.engine.getProperty('voices')
+            voices = self._voices
             if voices:
                 if voice_id is not None and 0 <= voice_id < len(voices):
                     self.engine.setProperty('voice', voices[voice_id].id)
-                    print(f"\nVoice changed to: {voices[voice_id].name}")
+                    logger.info("\nVoice changed to: %s", voices[voice_id].name)
                 else:
                     # List available voices
-                    print("\nAvailable voices:")
+                    logger.info("\nAvailable voices:")
                     for idx, voice in enumerate(voices):
-                        print(f"{idx}: {voice.name}")
+                        logger.info("%d: %s", idx, voice.name)
         except Exception as e:
-            print(f"Error setting voice: {e}")
+            logger.error("Error setting voice: %s", e)
 
     def get_current_settings(self):
         """Get current voice settings"""
@@ -198,9 +296,9 @@ class EnhancedVoiceManager:
                 'volume': self.engine.getProperty('volume'),
                 'rate': self.engine.getProperty('rate'),
                 'voice': self.engine.getProperty('voice'),
-                'voices': [voice.name for voice in self.engine.getProperty('voices')]
+                'voices': [voice.name for voice in self._voices]
             }
             return settings
         except Exception as e:
-            print(f"Error getting settings: {e}")
+            logger.error("Error getting settings: %s", e)
             return None
\ No newline at end of file
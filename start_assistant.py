@@ -3,10 +3,15 @@ import sys
 import asyncio
 import speech_recognition as sr
 import threading
-import queue
 import subprocess
 import time
 import requests
+from requests.adapters import HTTPAdapter
+import signal
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from typing import Optional
 from dotenv import load_dotenv
 
 # Add the current directory to Python path
@@ -19,66 +24,201 @@ from src.utils.screen_reader import ScreenReader
 from src.system_controller import SystemController
 from command_processor import EnhancedCommandProcessor
 from src.ai.ai_manager import AIManager
+from config.settings import initialize_directories
+from src.utils.logger import setup_queue_logging
 
 # Load environment variables
 load_dotenv()
 
+# Seconds between ambient noise recalibrations of the open microphone
+AMBIENT_RECALIBRATION_INTERVAL = 60
+# Listener retry delays after an error double from 1s up to this many seconds
+LISTENER_MAX_BACKOFF = 30
+# Seconds of silence that end a spoken phrase (speech_recognition defaults to 0.8)
+SPEECH_PAUSE_THRESHOLD = 0.5
+
+# AI answers remembered for repeated queries
+QUERY_CACHE_SIZE = 256
+
+# Commands handled at the same time; blocking work runs on as many threads
+COMMAND_CONCURRENCY = 4
+# Seconds commands still running at shutdown get to finish
+COMMAND_DRAIN_TIMEOUT = 5
+
+# Parsed command types that SystemController.execute_command carries out as-is
+SYSTEM_CONTROLLER_TYPES = ('vscode', 'browser', 'window', 'system')
+
+# Seconds to wait for the debug server to answer its health check
+SERVER_START_TIMEOUT = 10
+
+
+def _listener_backoff(failures: int) -> float:
+    """Seconds a listener waits before retrying after its nth consecutive failure"""
+    return min(2 ** min(failures - 1, 8), LISTENER_MAX_BACKOFF)
+
+
+# Printed by the help command
+HELP_TEXT = """
+        === AI Debug Assistant Commands ===
+
+        1. Voice Control:
+           - 'stop talking' or Ctrl+Shift+Space - Interrupt speech
+           - 'continue' or Ctrl+Shift+R - Resume speech
+           - Ctrl+Shift+Up/Down - Adjust volume
+           - Ctrl+Shift+Left/Right - Adjust speech rate
+
+        2. Screen Reading:
+           - 'read screen' - Read text from screen
+           - 'read code' - Read and analyze code
+           - 'show me' - Display current screen
+           - 'analyze this' - Analyze visible code
+
+        3. VS Code Control:
+           - 'open vs code'
+           - 'create workspace <name>'
+           - 'open file <path>'
+           - 'save file'
+           - 'close vs code'
+
+        4. Browser Control:
+           - 'open chrome/firefox'
+           - 'search for <query>'
+           - 'go to <website>'
+           - 'open private window'
+           - 'close browser'
+
+        5. Window Management:
+           - 'maximize/minimize <app>'
+           - 'restore window'
+           - 'switch to <app>'
+
+        6. System Control:
+           - 'set volume <level>'
+           - 'adjust brightness'
+           - 'restart system'
+           - 'shutdown computer'
+
+        7. Utility Commands:
+           - 'help' or '?' - Show this help
+           - 'history' - Show command history
+           - 'repeat' - Repeat last command
+           - 'quit' or 'exit' - Exit assistant
+
+        Note: You can also ask me any questions about coding, debugging, or system operations!
+        """
+
 
 class ServerManager:
     def __init__(self):
         self.server_url = "http://localhost:8000"
+        self.server_address = ("localhost", 8000)
         self.server_process = None
+        # Keeps the health-check connection alive between probes; the server is
+        # the only host this session talks to, so a small pool is enough
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
 
     def start_server(self):
         """Start the FastAPI server"""
+        return self.launch_server() and self.wait_for_server()
+
+    def launch_server(self) -> bool:
+        """Start the server process without waiting for it to come up"""
         try:
-            server_script = os.path.join("src", "main.py")
+            server_script = os.path.join("src", "server.py")
             if not os.path.exists(server_script):
                 print(f"Error: Server script not found at {server_script}")
                 return False
 
-            self.server_process = subprocess.Popen([sys.executable, server_script])
+            # Its own session on POSIX, so the whole tree can be signalled at once
+            self.server_process = subprocess.Popen([sys.executable, "-m", "src.server"],
+                                                   start_new_session=True)
             print("Starting server process...")
+            return True
+        except Exception as e:
+            print(f"Error starting server: {e}")
+            return False
 
-            # Wait for server to start
-            max_retries = 5
-            retry_delay = 2  # seconds
-
-            for attempt in range(max_retries):
-                try:
-                    response = requests.get(f"{self.server_url}/health")
-                    if response.status_code == 200:
-                        print("Debug server started successfully!")
-                        return True
-                except requests.exceptions.ConnectionError:
-                    print(f"Waiting for server to start (attempt {attempt + 1}/{max_retries})...")
-                    time.sleep(retry_delay)
-
-            print("Server failed to start after maximum retries")
+    def wait_for_server(self) -> bool:
+        """Wait until the launched server answers its health check"""
+        try:
+            # Probe often at first and back off
+            deadline = time.monotonic() + SERVER_START_TIMEOUT
+            retry_delay = 0.01  # seconds
+            attempt = 0
+
+            while True:
+                attempt += 1
+                if self.server_process.poll() is not None:
+                    print(f"Server process exited with code {self.server_process.returncode}")
+                    return False
+                if self._is_listening():
+                    try:
+                        response = self._session.get(f"{self.server_url}/health", timeout=2)
+                        if response.status_code == 200:
+                            print("Debug server started successfully!")
+                            return True
+                    except requests.exceptions.RequestException:
+                        pass
+
+                if time.monotonic() + retry_delay > deadline:
+                    break
+                if retry_delay >= 0.5:
+                    print(f"Waiting for server to start (attempt {attempt})...")
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 0.5)
+
+            print("Server failed to start in time")
             return False
         except Exception as e:
             print(f"Error starting server: {e}")
             return False
 
+    def _is_listening(self) -> bool:
+        """Check whether the server accepts connections yet, without an HTTP round trip"""
+        try:
+            with socket.create_connection(self.server_address, timeout=0.1):
+                return True
+        except OSError:
+            return False
+
+    def _signal_server_tree(self, force: bool):
+        """Stop the server process along with its workers and browser host"""
+        pid = self.server_process.pid
+        if os.name == 'nt':
+            # TerminateProcess would only end the uvicorn supervisor and leave
+            # its workers holding the port
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            try:
+                os.killpg(pid, signal.SIGKILL if force else signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
     def stop_server(self):
         """Stop the FastAPI server"""
         if self.server_process:
             try:
-                self.server_process.terminate()
+                self._signal_server_tree(force=False)
                 self.server_process.wait(timeout=5)
                 print("Server stopped successfully")
             except subprocess.TimeoutExpired:
+                self._signal_server_tree(force=True)
                 self.server_process.kill()
                 print("Server forcefully terminated")
             except Exception as e:
                 print(f"Error stopping server: {e}")
             finally:
                 self.server_process = None
+        self._session.close()
 
 
 class DebugAssistantClient:
     def __init__(self):
-        self.command_queue = queue.Queue()
+        # Filled from the listener threads via _submit_command
+        self.command_queue = asyncio.Queue()
+        self._loop = None
         self.running = False
         self.server_manager = ServerManager()
         self.system_controller = SystemController()
@@ -88,28 +228,79 @@ class DebugAssistantClient:
         self.screen_reader = ScreenReader()
         self.recognition_threshold = 0.7  # Confidence threshold for speech recognition
         self.last_command = None
-        self.command_history = []
         self.max_history = 10
+        self.command_history = deque(maxlen=self.max_history)
+        # Answers to recent AI queries, by normalized query text (oldest first)
+        self._query_cache = OrderedDict()
+        # OCR and other blocking calls that may overlap run here
+        self._executor = ThreadPoolExecutor(max_workers=COMMAND_CONCURRENCY, thread_name_prefix="assistant")
+        # System control calls and screen captures act on the desktop, so they run
+        # one at a time in the order the commands arrived ("open chrome", then "search for ...")
+        self._control_lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assistant-control")
+        self._command_slots = asyncio.Semaphore(COMMAND_CONCURRENCY)
+        self._command_tasks = set()
+
+        # Handlers for utility commands (by lowercased text) and parsed command types
+        self._builtin_handlers = {
+            'quit': self._quit_command,
+            'exit': self._quit_command,
+            'help': self._help_command,
+            '?': self._help_command,
+            'history': self._history_command,
+            'repeat': self._repeat_command,
+        }
+        # Keyed by (type, action); (type, None) handles any other action of that type
+        self._command_handlers = {
+            ('voice', 'stop'): self._voice_stop_command,
+            ('voice', 'resume'): self._voice_resume_command,
+            ('voice', 'volume'): self._voice_volume_command,
+            ('voice', None): self._ignore_command,
+            ('screen', 'read'): self._screen_read_command,
+            ('screen', 'read_code'): self._screen_read_code_command,
+            ('screen', None): self._ignore_command,
+        }
+        for command_type in SYSTEM_CONTROLLER_TYPES:
+            self._command_handlers[(command_type, None)] = self._system_controller_command
+
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the assistant's thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _run_in_order(self, func, *args):
+        """Run a desktop-affecting call on the serial control lane"""
+        return await asyncio.get_running_loop().run_in_executor(self._control_lane, func, *args)
+
+    async def _dispatch_command(self, command_type: str, command: str):
+        """Process a command, holding one of the concurrency slots until it finishes"""
+        try:
+            await self.process_command(command_type, command)
+        finally:
+            self._command_slots.release()
 
     async def start(self):
         """Start all services"""
         print("\n=== Starting AI Debug Assistant ===")
         self.voice_manager.speak("Initializing Debug Assistant...")
 
-        # Start server
-        if not self.server_manager.start_server():
+        # Start server; its interpreter starts up while the OpenAI connection is tested
+        if not self.server_manager.launch_server():
+            self.voice_manager.speak("Warning: Failed to start debug server")
+            return False
+        server_ready = asyncio.ensure_future(self._run_blocking(self.server_manager.wait_for_server))
+        openai_ok = await self.ai_manager.test_connection()
+
+        if not await server_ready:
             self.voice_manager.speak("Warning: Failed to start debug server")
             return False
 
         # Test OpenAI connection
-        if not await self.ai_manager.test_connection():
+        if not openai_ok:
             self.voice_manager.speak("Warning: OpenAI connection failed. Please check your API key.")
             return False
 
-        # Initialize screen reader
+        # Initialize screen reader (the first capture waits until a command needs one)
         try:
-            capture = self.screen_reader.capture_window(None)
-            if capture:
+            if self.screen_reader.is_available():
                 print("Screen reader initialized successfully")
         except Exception as e:
             print(f"Warning: Screen reader initialization error: {e}")
@@ -119,124 +310,112 @@ class DebugAssistantClient:
         return True
 
     def add_to_history(self, command: str):
-        """Add command to history"""
+        """Add command to history (the deque drops the oldest entry itself)"""
         self.command_history.append(command)
-        if len(self.command_history) > self.max_history:
-            self.command_history.pop(0)
 
     async def process_command(self, command_type: str, command: str):
         """Process command with enhanced error handling and features"""
         try:
+            previous_command = self.last_command
+
             # Add to history
             self.add_to_history(command)
             self.last_command = command
 
-            # Handle system commands
-            if command.lower() == 'quit':
-                self.running = False
-                self.voice_manager.speak("Shutting down. Goodbye!")
-                return
-
-            if command.lower() == 'help':
-                self.show_help()
-                return
-
-            if command.lower() == 'history':
-                self.show_command_history()
-                return
+            # Lowercased once for the utility command lookup and the query cache key
+            command_lc = command.strip().lower()
 
-            if command.lower() == 'repeat':
-                if self.last_command:
-                    await self.process_command(command_type, self.last_command)
+            # Handle system commands
+            builtin = self._builtin_handlers.get(command_lc)
+            if builtin:
+                await builtin(command_type, previous_command)
                 return
 
             # Parse and process command
             parsed = self.command_processor.parse_command(command)
 
-            # Handle voice control
-            if parsed['type'] == 'voice':
-                await self._handle_voice_command(parsed)
+            # Handle voice, screen, VS Code, browser, window and system commands
+            command_kind = parsed['type']
+            handler = (self._command_handlers.get((command_kind, parsed['action']))
+                       or self._command_handlers.get((command_kind, None)))
+            if handler:
+                await handler(parsed)
                 return
 
-            # Handle screen reading
-            if parsed['type'] == 'screen':
-                await self._handle_screen_command(parsed)
-                return
+            # Default to AI query; queries are stateless, so a repeat gets the earlier answer
+            query_key = " ".join(command_lc.split())
+            answer = self._query_cache.get(query_key)
+            if answer is None:
+                response = await self.ai_manager.process_query(command)
+                answer = response.get("response", "")
+                if response.get("command", {}).get("type") != "error":
+                    self._query_cache[query_key] = answer
+                    if len(self._query_cache) > QUERY_CACHE_SIZE:
+                        self._query_cache.popitem(last=False)
+            else:
+                self._query_cache.move_to_end(query_key)
+            self.voice_manager.speak(answer)
 
-            # Handle VS Code
-            if parsed['type'] == "vscode":
-                await self._handle_vscode_command(parsed)
-                return
+        except Exception as e:
+            error_msg = f"Error processing command: {str(e)}"
+            print(error_msg)
+            self.voice_manager.speak(f"Sorry, I encountered an error: {str(e)}")
 
-            # Handle browser
-            if parsed['type'] == "browser":
-                await self._handle_browser_command(parsed)
-                return
+    async def _quit_command(self, command_type: str, previous_command: Optional[str]):
+        self.running = False
+        self.command_queue.put_nowait(None)  # Wake the main loop so it can exit
+        self.voice_manager.speak("Shutting down. Goodbye!")
 
-            # Handle window
-            if parsed['type'] == "window":
-                await self._handle_window_command(parsed)
-                return
+    async def _help_command(self, command_type: str, previous_command: Optional[str]):
+        self.show_help()
 
-            # Handle system
-            if parsed['type'] == "system":
-                await self._handle_system_command(parsed)
-                return
+    async def _history_command(self, command_type: str, previous_command: Optional[str]):
+        self.show_command_history()
 
-            # Default to AI query
-            response = await self.ai_manager.process_query(command)
-            self.voice_manager.speak(response.get("response", ""))
+    async def _repeat_command(self, command_type: str, previous_command: Optional[str]):
+        # Repeat what ran before this 'repeat', not 'repeat' itself
+        if previous_command:
+            await self.process_command(command_type, previous_command)
 
-        except Exception as e:
-            error_msg = f"Error processing command: {str(e)}"
-            print(error_msg)
-            self.voice_manager.speak(f"Sorry, I encountered an error: {str(e)}")
+    async def _ignore_command(self, parsed):
+        """Recognized commands with nothing to do are not sent on as AI queries"""
 
-    async def _handle_voice_command(self, parsed):
-        """Handle voice control commands"""
-        if parsed['action'] == 'stop':
-            self.voice_manager.interrupt_speech()
-        elif parsed['action'] == 'resume':
-            self.voice_manager.resume_speech()
-        elif parsed['action'] == 'volume':
-            level = parsed['params'].get('level', 50)
-            if 'up' in parsed['params'].get('direction', ''):
-                self.voice_manager.increase_volume()
-            else:
-                self.voice_manager.decrease_volume()
-
-    async def _handle_screen_command(self, parsed):
-        """Handle screen reading commands"""
-        if parsed['action'] == 'read':
-            image = self.screen_reader.capture_window(None)
-            if image:
-                text = self.screen_reader.read_text_from_image(image)
-                self.voice_manager.speak(f"I see this text: {text}")
-        elif parsed['action'] == 'read_code':
-            code = self.screen_reader.read_code_from_editor()
-            if code:
-                self.voice_manager.speak("I found this code. Analyzing...")
-                analysis = await self.ai_manager.analyze_code(code)
-                self.voice_manager.speak(str(analysis))
-
-    async def _handle_vscode_command(self, parsed):
-        """Handle VS Code commands"""
-        result = self.system_controller.execute_command(parsed)
-        self.voice_manager.speak(result["message"])
+    async def _voice_stop_command(self, parsed):
+        self.voice_manager.interrupt_speech()
 
-    async def _handle_browser_command(self, parsed):
-        """Handle browser commands"""
-        result = self.system_controller.execute_command(parsed)
-        self.voice_manager.speak(result["message"])
+    async def _voice_resume_command(self, parsed):
+        self.voice_manager.resume_speech()
 
-    async def _handle_window_command(self, parsed):
-        """Handle window management commands"""
-        result = self.system_controller.execute_command(parsed)
-        self.voice_manager.speak(result["message"])
+    async def _voice_volume_command(self, parsed):
+        if 'up' in parsed['params'].get('direction', ''):
+            self.voice_manager.increase_volume()
+        else:
+            self.voice_manager.decrease_volume()
+
+    async def _screen_read_command(self, parsed):
+        """Read the text on screen aloud"""
+        image = await self._run_in_order(self.screen_reader.capture_window_gray, None)
+        if image:
+            text = await self._run_blocking(self.screen_reader.read_text_from_image, image)
+            self.voice_manager.speak(f"I see this text: {text}")
 
-    async def _handle_system_command(self, parsed):
-        """Handle system control commands"""
-        result = self.system_controller.execute_command(parsed)
+    async def _screen_read_code_command(self, parsed):
+        """Read the code in the editor and have it analyzed"""
+        # Only the capture holds the control lane; OCR runs in the screen reader's pool
+        ocr = await self._run_in_order(self.screen_reader.read_code_from_editor_async)
+        try:
+            code = await asyncio.wrap_future(ocr)
+        except Exception as e:
+            print(f"Error reading code: {e}")
+            code = ""
+        if code:
+            self.voice_manager.speak("I found this code. Analyzing...")
+            analysis = await self.ai_manager.analyze_code(code)
+            self.voice_manager.speak(str(analysis))
+
+    async def _system_controller_command(self, parsed):
+        """Handle VS Code, browser, window and system control commands"""
+        result = await self._run_in_order(self.system_controller.execute_command, parsed)
         self.voice_manager.speak(result["message"])
 
     def show_command_history(self):
@@ -253,102 +432,91 @@ class DebugAssistantClient:
 
     def show_help(self):
         """Display help information"""
-        help_text = """
-        === AI Debug Assistant Commands ===
-
-        1. Voice Control:
-           - 'stop talking' or Ctrl+Shift+Space - Interrupt speech
-           - 'continue' or Ctrl+Shift+R - Resume speech
-           - Ctrl+Shift+Up/Down - Adjust volume
-           - Ctrl+Shift+Left/Right - Adjust speech rate
-
-        2. Screen Reading:
-           - 'read screen' - Read text from screen
-           - 'read code' - Read and analyze code
-           - 'show me' - Display current screen
-           - 'analyze this' - Analyze visible code
-
-        3. VS Code Control:
-           - 'open vs code'
-           - 'create workspace <name>'
-           - 'open file <path>'
-           - 'save file'
-           - 'close vs code'
-
-        4. Browser Control:
-           - 'open chrome/firefox'
-           - 'search for <query>'
-           - 'go to <website>'
-           - 'open private window'
-           - 'close browser'
+        print(HELP_TEXT)
+        self.voice_manager.speak("Help menu displayed.", chunked=False)
 
-        5. Window Management:
-           - 'maximize/minimize <app>'
-           - 'restore window'
-           - 'switch to <app>'
+    def _submit_command(self, command_type: str, command: str):
+        """Queue a command for the event loop (called from listener threads)"""
+        self._loop.call_soon_threadsafe(self.command_queue.put_nowait, (command_type, command))
 
-        6. System Control:
-           - 'set volume <level>'
-           - 'adjust brightness'
-           - 'restart system'
-           - 'shutdown computer'
+    def _recognize_speech(self, recognizer: sr.Recognizer, audio: sr.AudioData):
+        """Transcribe one phrase and submit it as a voice command"""
+        try:
+            command = recognizer.recognize_google(audio)
+            confidence = getattr(recognizer, 'confidence', 1.0)
 
-        7. Utility Commands:
-           - 'help' - Show this help
-           - 'history' - Show command history
-           - 'repeat' - Repeat last command
-           - 'quit' - Exit assistant
+            if confidence >= self.recognition_threshold:
+                print(f"\n🎙️ You said: {command}")
+                self._submit_command("voice", command)
+            else:
+                print(f"Low confidence ({confidence}), ignored: {command}")
 
-        Note: You can also ask me any questions about coding, debugging, or system operations!
-        """
-        print(help_text)
-        self.voice_manager.speak(
-            "I've displayed the help menu on screen. I can help with voice control, screen reading, "
-            "VS Code, browsers, system control and more. What would you like to do?"
-        )
+        except sr.UnknownValueError:
+            pass  # Ignore unrecognized speech
+        except sr.RequestError as e:
+            print(f"Could not request results: {e}")
+        except Exception as e:
+            print(f"Error in voice recognition: {e}")
 
     def voice_listener(self):
         """Enhanced voice command listener"""
         recognizer = sr.Recognizer()
         recognizer.dynamic_energy_threshold = True
         recognizer.energy_threshold = 4000
+        recognizer.pause_threshold = SPEECH_PAUSE_THRESHOLD
+        # Phrases are transcribed while the next one is being recorded; a single
+        # worker keeps them in the order they were spoken
+        recognition = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech-recognition")
+        failures = 0
 
-        while self.running:
-            try:
-                with sr.Microphone() as source:
-                    print("\nListening...")
-                    # Reduce ambient noise impact
-                    recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                    audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
-
+        try:
+            while self.running:
                 try:
-                    command = recognizer.recognize_google(audio)
-                    confidence = getattr(recognizer, 'confidence', 1.0)
-
-                    if confidence >= self.recognition_threshold:
-                        print(f"\n🎙️ You said: {command}")
-                        self.command_queue.put(("voice", command))
-                    else:
-                        print(f"Low confidence ({confidence}), ignored: {command}")
+                    # Keep one microphone stream open; it is only reopened after an error
+                    with sr.Microphone() as source:
+                        # Reduce ambient noise impact
+                        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                        last_calibration = time.monotonic()
+
+                        while self.running:
+                            if time.monotonic() - last_calibration > AMBIENT_RECALIBRATION_INTERVAL:
+                                recognizer.adjust_for_ambient_noise(source, duration=0.2)
+                                last_calibration = time.monotonic()
+
+                            print("\nListening...")
+                            try:
+                                audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
+                            except sr.WaitTimeoutError:
+                                continue  # Nobody spoke; keep listening
+                            # Only a phrase actually recorded shows the stream is healthy
+                            failures = 0
+
+                            recognition.submit(self._recognize_speech, recognizer, audio)
 
-                except sr.UnknownValueError:
-                    pass  # Ignore unrecognized speech
-                except sr.RequestError as e:
-                    print(f"Could not request results: {e}")
-
-            except Exception as e:
-                print(f"Error in voice listening: {e}")
-                time.sleep(1)  # Prevent rapid retries
+                except Exception as e:
+                    print(f"Error in voice listening: {e}")
+                    failures += 1
+                    time.sleep(_listener_backoff(failures))  # Prevent rapid retries
+        finally:
+            recognition.shutdown(wait=False)
 
     def chat_listener(self):
         """Text command listener"""
+        failures = 0
         while self.running:
             try:
                 user_input = input("\nEnter command (or 'help'/'quit'): ")
+                if not self.running:
+                    break  # Typed after quit; the event loop is shutting down
                 if user_input.strip():  # Ignore empty input
-                    self.command_queue.put(("chat", user_input))
+                    self._submit_command("chat", user_input)
+                failures = 0
+            except EOFError:
+                break  # stdin was closed (Ctrl+Z/Ctrl+D or redirected input ran out)
             except Exception as e:
                 print(f"Error in chat input: {e}")
+                failures += 1
+                time.sleep(_listener_backoff(failures))
 
     async def run(self):
         """Run the assistant with enhanced error handling"""
@@ -357,6 +525,7 @@ class DebugAssistantClient:
             return
 
         self.running = True
+        self._loop = asyncio.get_running_loop()
 
         # Start voice and chat listeners
         voice_thread = threading.Thread(target=self.voice_listener)
@@ -374,28 +543,40 @@ class DebugAssistantClient:
         try:
             while self.running:
                 try:
-                    command_type, command = self.command_queue.get(timeout=1)
-                    await self.process_command(command_type, command)
-                except queue.Empty:
-                    continue  # No command to process
+                    item = await self.command_queue.get()
+                    if item is None:  # Quit requested
+                        break
+
+                    # Handle commands concurrently, at most COMMAND_CONCURRENCY at a time
+                    await self._command_slots.acquire()
+                    task = asyncio.create_task(self._dispatch_command(*item))
+                    self._command_tasks.add(task)
+                    task.add_done_callback(self._command_tasks.discard)
                 except Exception as e:
                     print(f"Error in main loop: {e}")
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run delivers Ctrl+C to the awaiting task as a cancellation
             print("\nReceived interrupt signal...")
             self.voice_manager.speak("Shutting down gracefully...")
         finally:
             self.running = False
             print("\nCleaning up...")
+            # Let commands already in progress finish
+            if self._command_tasks:
+                await asyncio.wait(self._command_tasks, timeout=COMMAND_DRAIN_TIMEOUT)
             self.voice_manager.shutdown()
             self.server_manager.stop_server()
+            self._executor.shutdown(wait=False)
+            self._control_lane.shutdown(wait=False)
             print("Shutdown complete. Goodbye!")
 
 
 if __name__ == "__main__":
     # Set up console title
     if os.name == 'nt':  # Windows
-        os.system('title AI Debug Assistant')
+        import ctypes
+        ctypes.windll.kernel32.SetConsoleTitleW('AI Debug Assistant')
     else:  # Unix/Linux/MacOS
         print('\33]0;AI Debug Assistant\a', end='', flush=True)
 
@@ -405,5 +586,11 @@ if __name__ == "__main__":
     ================================
     """)
 
+    initialize_directories()
+    # Status lines from src modules are printed as plain messages by a background thread
+    setup_queue_logging("src", fmt="%(message)s")
     assistant = DebugAssistantClient()
-    asyncio.run(assistant.run())
\ No newline at end of file
+    try:
+        asyncio.run(assistant.run())
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
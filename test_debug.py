@@ -1,3 +1,4 @@
+import orjson
 import requests
 
 # Simple bug example
@@ -16,10 +17,12 @@ debug_request = {
 }
 
 # Make the request
-response = requests.post(
-    "http://localhost:8000/api/debug",
-    json=debug_request
-)
+with requests.Session() as session:
+    response = session.post(
+        "http://localhost:8000/api/debug",
+        data=orjson.dumps(debug_request),
+        headers={"Content-Type": "application/json"}
+    )
 
 # Print response
 print("\nStatus Code:", response.status_code)